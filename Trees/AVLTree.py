@@ -3,8 +3,30 @@ This file implements the AVL Tree data structure.
 The functions in this file are considerably harder than the functions in the BinaryTree and BST files.
 '''
 
+import bisect
+import copy
+
 from Trees.BinaryTree import BinaryTree, Node
-from Trees.BST import BST
+from Trees.BST import BST, BSTNode
+
+
+class AVLNode(BSTNode):
+    '''
+    A BSTNode that also remembers the height of the subtree rooted at it.
+    Caching the height is what makes the AVLTree fast:
+    the balance factor of an AVLNode can be read off in O(1)
+    instead of walking both of its subtrees.
+
+    The owner is the token of the AVLTree that may modify the node in place after a snapshot
+    (see AVLTree.snapshot); None means the node has not been copied since the last snapshot.
+    '''
+    __slots__ = ('height', 'owner')
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.height = 0
+        self.owner = None
+
 
 class AVLTree(BST):
     '''
@@ -20,6 +42,7 @@ class AVLTree(BST):
         '''
         super().__init__()
         self.root = None
+        self._owner = None
         if xs:
             self.insert_list(xs)
 
@@ -36,12 +59,54 @@ class AVLTree(BST):
         '''
         if node is None:
             return 0
-        return BinaryTree._height(node.left) - BinaryTree._height(node.right)
+        return AVLTree._get_height(node.left) - AVLTree._get_height(node.right)
+
+
+    @staticmethod
+    def _get_height(node):
+        '''
+        Returns the height of a node.
+        AVLNodes carry a cached height, so this is O(1) for every node the AVLTree creates itself.
+        Plain Nodes (for example trees that were wired up by hand) have no cache,
+        so for those we fall back to walking the subtree.
+        '''
+        if node is None:
+            return -1
+        if isinstance(node, AVLNode):
+            return node.height
+        return BinaryTree._height(node)
+
+
+    @staticmethod
+    def _make_node(value):
+        return AVLNode(value)
+
+
+    @staticmethod
+    def _update(node):
+        '''
+        Refreshes both the cached height and the cached size of node.
+        '''
+        AVLTree._update_height(node)
+        BST._update(node)
+
+
+    @staticmethod
+    def _update_height(node):
+        '''
+        Recomputes the cached height of node from the cached heights of its children.
+        This must be called bottom up whenever the children of an AVLNode change.
+        '''
+        if isinstance(node, AVLNode):
+            node.height = 1 + max(AVLTree._get_height(node.left), AVLTree._get_height(node.right))
 
 
     def is_avl_satisfied(self):
         '''
         Returns True if the avl tree satisfies that all nodes have a balance factor in [-1,0,1].
+        This is a full audit of the tree:
+        it recomputes every height from scratch rather than trusting the cached heights,
+        and it also checks that the cached heights are correct.
         '''
         return AVLTree._is_avl_satisfied(self.root)
 
@@ -49,11 +114,31 @@ class AVLTree(BST):
     @staticmethod
     def _is_avl_satisfied(node):
         '''
-        Implement this function.
+        Checks the whole subtree in a single O(n) pass.
+        '''
+        return AVLTree._audit_height(node) is not None
+
+
+    @staticmethod
+    def _audit_height(node):
+        '''
+        Returns the true height of node,
+        or None if some node below it is out of balance or has a stale cached height.
         '''
         if node is None:
-            return True
-        return AVLTree._balance_factor(node) in [-1, 0, 1] and AVLTree._is_avl_satisfied(node.left) and AVLTree._is_avl_satisfied(node.right)
+            return -1
+        left_height = AVLTree._audit_height(node.left)
+        if left_height is None:
+            return None
+        right_height = AVLTree._audit_height(node.right)
+        if right_height is None:
+            return None
+        if left_height - right_height not in [-1, 0, 1]:
+            return None
+        height = 1 + max(left_height, right_height)
+        if isinstance(node, AVLNode) and node.height != height:
+            return None
+        return height
 
 
     @staticmethod
@@ -64,15 +149,20 @@ class AVLTree(BST):
         and the textbook provides full python code.
         The textbook's class hierarchy for their AVL tree code is fairly different from our class hierarchy,
         however, so you will have to adapt their code.
+
+        The rotation relinks the existing nodes in place rather than allocating new ones,
+        so any outside reference to a node stays valid.
+        Only the two nodes that change position need their cached heights and sizes refreshed,
+        and the old root must be refreshed first because it ends up below the new root.
         '''
         if node is None or node.right is None:
             return node
 
-        new_root = Node(node.right.value)
-        new_root.right = node.right.right
-        new_root.left = Node(node.value)
-        new_root.left.left = node.left
-        new_root.left.right = node.right.left
+        new_root = node.right
+        node.right = new_root.left
+        new_root.left = node
+        AVLTree._update(node)
+        AVLTree._update(new_root)
 
         return new_root
 
@@ -85,15 +175,17 @@ class AVLTree(BST):
         and the textbook provides full python code.
         The textbook's class hierarchy for their AVL tree code is fairly different from our class hierarchy,
         however, so you will have to adapt their code.
+
+        Like _left_rotate, this relinks the existing nodes in place.
         '''
         if node is None or node.left is None:
             return node
 
-        new_root = Node(node.left.value)
-        new_root.left = node.left.left
-        new_root.right = Node(node.value)
-        new_root.right.left = node.left.right
-        new_root.right.right = node.right
+        new_root = node.left
+        node.left = new_root.right
+        new_root.right = node
+        AVLTree._update(node)
+        AVLTree._update(new_root)
 
         return new_root
 
@@ -110,43 +202,448 @@ class AVLTree(BST):
         The code should look very similar to the code for your insert function for the BST,
         but it will also call the left and right rebalancing functions.
         '''
-        if self.root is None:
-            self.root = Node(value)
+        if self._owner is None:
+            self.root = AVLTree._insert_node(self._make_node(value), self.root)
         else:
-            self.root = AVLTree._insert(value, self.root)
+            self.root = AVLTree._insert_copy(self._make_node(value), self.root, self._owner)
+
+
+    @staticmethod
+    def _insert(value, node):
+        '''
+        Inserts value below node and returns the new (rebalanced) root of this subtree.
+        This overrides BST._insert, which would insert without rebalancing.
+        '''
+        return AVLTree._insert_node(AVLNode(value), node)
+
+
+    @staticmethod
+    def _insert_node(new_node, node):
+        '''
+        Attaches new_node below node and returns the new root of this subtree.
+        (Taking a ready-made node rather than a value lets subclasses insert their own kinds of node.)
+        Only the nodes on the path from node down to the new leaf can change height (or size),
+        so we refresh their cached heights and sizes and rebalance them on the way back up.
+        Each step is O(1), which makes the whole insert O(log n).
+        '''
+        if node is None:
+            return new_node
+        if new_node.value < node.value:
+            node.left = AVLTree._insert_node(new_node, node.left)
+        elif new_node.value > node.value:
+            node.right = AVLTree._insert_node(new_node, node.right)
+        else:
+            print("Value is already present in tree.")
+            return node
+
+        AVLTree._update(node)
+        return AVLTree.rebalance(node)
+
+
+    def remove(self, value):
+        '''
+        Removes value from the AVLTree.
+        If value is not in the AVLTree, it does nothing.
+        Unlike BST.remove, this rebalances every node on the path back up to the root,
+        so the tree stays an AVL tree and the remove is O(log n).
+        '''
+        if self._owner is None:
+            self.root = AVLTree._remove(self.root, value)
+        else:
+            self.root = AVLTree._remove_copy(self.root, value, self._owner)
+
+
+    @staticmethod
+    def _remove(node, value):
+        if node is None:
+            return node
+        if node.value > value:
+            node.left = AVLTree._remove(node.left, value)
+        elif node.value < value:
+            node.right = AVLTree._remove(node.right, value)
+        else:   # node.value == value
+
+            # one child
+            if node.left is None:
+                return node.right
+            elif node.right is None:
+                return node.left
+
+            # two children: the successor node takes the place of node
+            right, successor = AVLTree._remove_smallest(node.right)
+            successor.left = node.left
+            successor.right = right
+            node = successor
+
+        AVLTree._update(node)
+        return AVLTree.rebalance(node)
+
+
+    @staticmethod
+    def _remove_smallest(node):
+        '''
+        Detaches the node holding the smallest value below node.
+        Returns the new (rebalanced) root of the subtree together with the detached node.
+        '''
+        if node.left is None:
+            return node.right, node
+        node.left, smallest = AVLTree._remove_smallest(node.left)
+        AVLTree._update(node)
+        return AVLTree.rebalance(node), smallest
+
+
+    def remove_list(self, xs):
+        '''
+        Given a list xs, remove each element of xs from self.
+        Instead of one descent from the root per element,
+        the sorted batch is pushed down the tree in a single pass:
+        at every node the batch is split into the keys that belong in the left and right subtrees,
+        and the two pruned subtrees are then joined back together.
+        Removing m keys from a tree of n keys this way costs O(m log(n/m + 1)).
+        '''
+        if self._owner is not None:
+            # _remove_sorted relinks nodes in place, so after a snapshot remove them one at a time instead
+            for x in xs:
+                self.remove(x)
+            return
+        xs = sorted(xs)
+        self.root = AVLTree._remove_sorted(self.root, xs, 0, len(xs))
 
 
     def insert_list(self, xs):
         '''
         Given a list xs, insert each element of xs into self.
+        Large sorted batches are linked into the tree in bulk (see BST.insert_list),
+        which reuses the nodes already in the tree.
+        After a snapshot those nodes are shared,
+        so a batch at least as large as the tree first gets its own copy of the tree;
+        the copy costs no more than the batch itself.
         '''
-        for x in xs:
-            self.insert(x)
+        xs = list(xs)
+        if self._owner is not None and len(xs) >= len(self):
+            self._unshare()
+        super().insert_list(xs)
 
 
     @staticmethod
-    def _insert(value, node):
-        if value < node.value:
-            if node.left is None:
-                node.left = Node(value)
-            else:
-                AVLTree._insert(value, node.left)
-        elif value > node.value:
-            if node.right is None:
-                node.right = Node(value)
-            else:
-                AVLTree._insert(value, node.right)
+    def _remove_sorted(node, xs, lo, hi):
+        '''
+        Removes the values xs[lo:hi] (which must be sorted) from the subtree below node,
+        and returns the new root of the subtree.
+        '''
+        if node is None or lo >= hi:
+            return node
+        i = bisect.bisect_left(xs, node.value, lo, hi)
+        j = bisect.bisect_right(xs, node.value, i, hi)
+        left = AVLTree._remove_sorted(node.left, xs, lo, i)
+        right = AVLTree._remove_sorted(node.right, xs, j, hi)
+        if i < j:
+            return AVLTree._join_pair(left, right)
+        return AVLTree._join(left, node, right)
+
+
+    def split(self, key):
+        '''
+        Splits the tree into two AVLTrees (lt, ge),
+        where lt holds the values smaller than key and ge holds the rest.
+        The nodes are moved rather than copied, so this is O(log n),
+        and self is left empty.
+        '''
+        self._unshare()
+        lt, ge = AVLTree._split(self.root, key, True)
+        self.root = None
+        return self._wrap(lt), self._wrap(ge)
+
+
+    @classmethod
+    def join(cls, left, right):
+        '''
+        Returns a single AVLTree holding the values of the trees left and right.
+        Every value in left must be smaller than every value in right.
+        Like split, this moves the nodes rather than copying them,
+        so it is O(log n) and both left and right are left empty.
+        '''
+        if left.root is not None and right.root is not None:
+            if not BST._find_largest(left.root) < BST._find_smallest(right.root):
+                raise ValueError('every value of left must be smaller than every value of right')
+        left._unshare()
+        right._unshare()
+        tree = cls()
+        tree.root = AVLTree._join_pair(left.root, right.root)
+        left.root = None
+        right.root = None
+        return tree
+
+
+    def remove_range(self, lo=None, hi=None, inclusive=(True, True)):
+        '''
+        Removes every value between lo and hi from the tree
+        (lo and hi are treated like the arguments of irange).
+        The tree is split at lo and at hi, and the two outer pieces are joined back together,
+        so this is O(log n) no matter how many values are removed.
+        '''
+        self._unshare()
+        left, middle = None, self.root
+        if lo is not None:
+            left, middle = AVLTree._split(middle, lo, inclusive[0])
+        right = None
+        if hi is not None:
+            middle, right = AVLTree._split(middle, hi, not inclusive[1])
+        self.root = AVLTree._join_pair(left, right)
+
+
+    def snapshot(self):
+        '''
+        Returns a copy of the tree in O(1) time and memory.
+
+        The copy shares every node with self.
+        From then on, both trees are copy-on-write:
+        insert and remove copy the O(log n) nodes on the path they change
+        (see _insert_copy and _remove_copy) instead of modifying shared nodes,
+        so changes to one tree are never seen by the other.
+
+        Each tree gets a new token, and every copy it makes is stamped with that token as its owner.
+        A node whose owner is the tree's own token can only be reached from that tree,
+        so later changes modify it in place rather than copying it again.
+        Only the first change along a path pays for the copies,
+        and once the shared part of the tree has been touched the tree runs about as fast as before the snapshot.
+        The bulk operations (split, join, remove_range, and large insert_lists) relink many nodes at once,
+        so they first give the tree its own copy of every node, which costs O(n) once.
+        '''
+        self._owner = object()
+        tree = self._wrap(self.root)
+        tree._owner = object()
+        return tree
+
+
+    def _unshare(self):
+        '''
+        If the tree may share nodes with a snapshot,
+        replaces every node with a private copy so that it is safe to modify the nodes in place again.
+        '''
+        if self._owner is not None:
+            self.root = AVLTree._copy_tree(self.root)
+            self._owner = None
+
+
+    @staticmethod
+    def _copy_tree(node):
+        if node is None:
+            return None
+        new = copy.copy(node)
+        new.left = AVLTree._copy_tree(node.left)
+        new.right = AVLTree._copy_tree(node.right)
+        return new
+
+
+    @staticmethod
+    def _own(node, owner):
+        '''
+        Returns node if it belongs to owner,
+        and otherwise a copy of node that belongs to owner and so may be modified.
+        '''
+        if getattr(node, 'owner', None) is owner:
+            return node
+        node = copy.copy(node)
+        if isinstance(node, AVLNode):
+            node.owner = owner
+        return node
+
+
+    @staticmethod
+    def _insert_copy(new_node, node, owner, replace=False):
+        '''
+        Like _insert_node, but never modifies the nodes below node that other trees may share.
+        Each node on the path down to the new leaf that does not belong to owner is copied
+        and the copy is modified instead,
+        so the insert allocates at most O(log n) nodes and all the other nodes stay shared.
+        If the subtree already holds new_node.value, the subtree is left as it is,
+        unless replace is set, in which case new_node replaces that node
+        (TreeMap uses this to change the payload of a shared node).
+        '''
+        if node is None:
+            new_node.owner = owner
+            return new_node
+        if new_node.value < node.value:
+            node = AVLTree._own(node, owner)
+            node.left = AVLTree._insert_copy(new_node, node.left, owner, replace)
+        elif new_node.value > node.value:
+            node = AVLTree._own(node, owner)
+            node.right = AVLTree._insert_copy(new_node, node.right, owner, replace)
+        elif replace:
+            new_node.owner = owner
+            new_node.left = node.left
+            new_node.right = node.right
+            AVLTree._update(new_node)
+            return new_node
         else:
             print("Value is already present in tree.")
+            return node
+
+        AVLTree._update(node)
+        return AVLTree._rebalance_copy(node, owner)
+
+
+    @staticmethod
+    def _remove_copy(node, value, owner):
+        '''
+        Like _remove, but copies the nodes on the path that do not belong to owner instead of modifying them.
+        '''
+        if node is None:
+            return node
+        if node.value > value:
+            node = AVLTree._own(node, owner)
+            node.left = AVLTree._remove_copy(node.left, value, owner)
+        elif node.value < value:
+            node = AVLTree._own(node, owner)
+            node.right = AVLTree._remove_copy(node.right, value, owner)
+        else:
+            if node.left is None:
+                return node.right
+            elif node.right is None:
+                return node.left
+
+            right, successor = AVLTree._remove_smallest_copy(node.right, owner)
+            successor.left = node.left
+            successor.right = right
+            node = successor
+
+        AVLTree._update(node)
+        return AVLTree._rebalance_copy(node, owner)
+
+
+    @staticmethod
+    def _remove_smallest_copy(node, owner):
+        '''
+        Like _remove_smallest, but the detached node and every node on the path to it belong to owner.
+        '''
+        if node.left is None:
+            return node.right, AVLTree._own(node, owner)
+        node = AVLTree._own(node, owner)
+        node.left, smallest = AVLTree._remove_smallest_copy(node.left, owner)
+        AVLTree._update(node)
+        return AVLTree._rebalance_copy(node, owner), smallest
 
-        if AVLTree._is_avl_satisfied(node) == False:
-            node.left = AVLTree.rebalance(node.left)
-            node.right = AVLTree.rebalance(node.right)
-            return AVLTree.rebalance(node)
+
+    @staticmethod
+    def _rebalance_copy(node, owner):
+        '''
+        Like rebalance, for a node that already belongs to owner.
+        The rotations also modify the children of node (and one grandchild for a double rotation),
+        and those may still be shared, so they are copied first unless they belong to owner too.
+        '''
+        if AVLTree._balance_factor(node) < -1:
+            node.right = AVLTree._own(node.right, owner)
+            if AVLTree._balance_factor(node.right) > 0:
+                node.right.left = AVLTree._own(node.right.left, owner)
+                node.right = AVLTree._right_rotate(node.right)
+            return AVLTree._left_rotate(node)
+        elif AVLTree._balance_factor(node) > 1:
+            node.left = AVLTree._own(node.left, owner)
+            if AVLTree._balance_factor(node.left) < 0:
+                node.left.right = AVLTree._own(node.left.right, owner)
+                node.left = AVLTree._left_rotate(node.left)
+            return AVLTree._right_rotate(node)
         else:
             return node
 
 
+    def _wrap(self, node):
+        '''
+        Returns a new tree of the same type as self whose root is node.
+        '''
+        tree = type(self)()
+        tree.root = node
+        return tree
+
+
+    @staticmethod
+    def _split(node, key, key_right):
+        '''
+        Splits the subtree below node into two AVL trees (left, right)
+        holding the values smaller than key and the values larger than key.
+        If key itself is in the subtree, it goes to right when key_right is True and to left otherwise.
+        Walking down towards key, every node along the way is joined (with its other subtree)
+        onto one of the two halves; the joins telescope, so the total cost is O(log n).
+        '''
+        if node is None:
+            return None, None
+        if node.value < key or (node.value == key and not key_right):
+            left, right = AVLTree._split(node.right, key, key_right)
+            return AVLTree._join(node.left, node, left), right
+        else:
+            left, right = AVLTree._split(node.left, key, key_right)
+            return left, AVLTree._join(right, node, node.right)
+
+
+    @staticmethod
+    def _join(left, node, right):
+        '''
+        Returns an AVL tree holding the nodes of left, then node, then the nodes of right.
+        Every value in left must be smaller than node.value,
+        and every value in right must be larger.
+        The two trees may have very different heights;
+        the shorter one is hung off the spine of the taller one at the level where the heights match,
+        so the cost is O(|height(left) - height(right)| + 1).
+        '''
+        if AVLTree._get_height(left) > AVLTree._get_height(right) + 1:
+            return AVLTree._join_right(left, node, right)
+        if AVLTree._get_height(right) > AVLTree._get_height(left) + 1:
+            return AVLTree._join_left(left, node, right)
+        node.left = left
+        node.right = right
+        AVLTree._update(node)
+        return node
+
+
+    @staticmethod
+    def _join_right(left, node, right):
+        '''
+        The case of _join where left is the taller tree:
+        walk down the right spine of left.
+        '''
+        if AVLTree._get_height(left.right) <= AVLTree._get_height(right) + 1:
+            node.left = left.right
+            node.right = right
+            AVLTree._update(node)
+            left.right = node
+        else:
+            left.right = AVLTree._join_right(left.right, node, right)
+        AVLTree._update(left)
+        return AVLTree.rebalance(left)
+
+
+    @staticmethod
+    def _join_left(left, node, right):
+        '''
+        The case of _join where right is the taller tree:
+        walk down the left spine of right.
+        '''
+        if AVLTree._get_height(right.left) <= AVLTree._get_height(left) + 1:
+            node.left = left
+            node.right = right.left
+            AVLTree._update(node)
+            right.left = node
+        else:
+            right.left = AVLTree._join_left(left, node, right.left)
+        AVLTree._update(right)
+        return AVLTree.rebalance(right)
+
+
+    @staticmethod
+    def _join_pair(left, right):
+        '''
+        Like _join, but without a middle node:
+        the smallest node of right is detached and used as the middle node instead.
+        '''
+        if left is None:
+            return right
+        if right is None:
+            return left
+        right, smallest = AVLTree._remove_smallest(right)
+        return AVLTree._join(left, smallest, right)
+
+
     @staticmethod
     def rebalance(node):
         if AVLTree._balance_factor(node) < -1:
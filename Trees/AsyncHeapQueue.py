@@ -0,0 +1,100 @@
+'''
+This file implements an asyncio priority queue on top of the Heap.
+'''
+
+import asyncio
+import itertools
+
+from Trees.Heap import Heap
+
+
+class _HeapQueue(asyncio.Queue):
+    '''
+    An asyncio.Queue whose storage is a Heap.
+    asyncio.Queue does all of the waiting (for maxsize, get, and join) itself
+    and only calls _init, _put, and _get to store and retrieve entries,
+    which is the same way the standard library's asyncio.PriorityQueue is built on heapq.
+    '''
+
+    def _init(self, maxsize):
+        self._queue = Heap()
+
+    def _put(self, entry):
+        self._queue.insert(entry)
+
+    def _get(self):
+        return self._queue.remove_min()
+
+
+class AsyncHeapQueue:
+    '''
+    A priority queue for asyncio tasks:
+    get returns the item with the smallest priority,
+    and items with equal priorities come out in the order they were put in.
+
+    It behaves like asyncio.Queue:
+    get waits until an item is available,
+    put waits while the queue already holds maxsize items (if maxsize > 0),
+    and join waits until task_done has been called once for every item put in.
+    put_nowait and get_nowait raise asyncio.QueueFull and asyncio.QueueEmpty instead of waiting.
+
+    Internally every item is stored in the Heap as a tuple (priority, count, item),
+    where count increases with every put.
+    The count makes equal priorities come out in first-in first-out order,
+    and it also means that the items themselves are never compared.
+    Both put and get are O(log n).
+    '''
+
+    def __init__(self, maxsize=0):
+        self._queue = _HeapQueue(maxsize)
+        self._counter = itertools.count()
+
+    def __repr__(self):
+        return '<'+type(self).__name__+' maxsize='+str(self.maxsize)+' qsize='+str(self.qsize())+'>'
+
+    @property
+    def maxsize(self):
+        return self._queue.maxsize
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def empty(self):
+        return self._queue.empty()
+
+    def full(self):
+        return self._queue.full()
+
+    async def put(self, item, priority):
+        '''
+        Puts item into the queue, waiting for a free slot if the queue is full.
+        '''
+        await self._queue.put((priority, next(self._counter), item))
+
+    def put_nowait(self, item, priority):
+        self._queue.put_nowait((priority, next(self._counter), item))
+
+    async def get(self):
+        '''
+        Removes and returns the item with the smallest priority,
+        waiting for an item to be put in if the queue is empty.
+        '''
+        return (await self._queue.get())[2]
+
+    def get_nowait(self):
+        return self._queue.get_nowait()[2]
+
+    def peek_nowait(self):
+        '''
+        Returns the item with the smallest priority without removing it.
+        Raises asyncio.QueueEmpty if the queue is empty.
+        '''
+        if self._queue.empty():
+            raise asyncio.QueueEmpty
+        return self._queue._queue.find_smallest()[2]
+
+    def task_done(self):
+        self._queue.task_done()
+
+    async def join(self):
+        await self._queue.join()
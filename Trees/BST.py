@@ -3,7 +3,24 @@ This file implements the Binary Search Tree data structure.
 The functions in this file are considerably harder than the functions in the BinaryTree file.
 '''
 
+import heapq
+
 from Trees.BinaryTree import BinaryTree, Node
+from Trees.BinaryFormat import write_values, read_values, SORTED
+
+
+class BSTNode(Node):
+    '''
+    A Node that also stores the number of nodes in the subtree rooted at it.
+    With these counts the BST can find the k-th smallest value, or the rank of a value,
+    by walking down a single path instead of visiting every node.
+    '''
+    __slots__ = ('size',)
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.size = 1
+
 
 class BST(BinaryTree):
     '''
@@ -12,6 +29,9 @@ class BST(BinaryTree):
     and in the constructor below.
     '''
 
+    # insert_list only considers rebuilding the whole tree for batches at least this large
+    _BULK_INSERT_THRESHOLD = 64
+
     def __init__(self, xs=None):
         '''
         If xs is a list (i.e. xs is not None),
@@ -38,6 +58,158 @@ class BST(BinaryTree):
         return type(self).__name__+'('+str(self.to_list('inorder'))+')'
 
 
+    def __len__(self):
+        '''
+        The root of the tree stores the size of the whole tree,
+        so unlike BinaryTree.__len__ this is O(1).
+        '''
+        return BST._get_size(self.root)
+
+
+    @classmethod
+    def from_sorted(cls, xs):
+        '''
+        Builds a perfectly balanced tree from xs in O(n).
+        xs must already be sorted; repeated values are only inserted once.
+        '''
+        xs = list(xs)
+        if not BST._is_sorted(xs):
+            raise ValueError('from_sorted requires sorted input')
+        nodes = [cls._make_node(x) for x in BST._unique(xs)]
+        tree = cls()
+        tree.root = cls._link_balanced(nodes, 0, len(nodes))
+        return tree
+
+
+    @classmethod
+    def from_iterable(cls, xs):
+        '''
+        Like from_sorted, but xs can be in any order.
+        Sorting costs O(n log n), which is still much cheaper than inserting the values one at a time.
+        '''
+        return cls.from_sorted(sorted(xs))
+
+
+    def dump(self, fp):
+        '''
+        Writes the values of the tree to the binary file object fp in sorted order
+        (see BinaryFormat.py for the format).
+        The shape of the tree is not stored; load always builds a balanced tree.
+        '''
+        write_values(fp, self.to_list('inorder'), SORTED)
+
+
+    @classmethod
+    def load(cls, fp):
+        '''
+        Reads a tree written by dump from the binary file object fp.
+        The values are stored in sorted order,
+        so this is an O(n) from_sorted rather than n separate inserts.
+        '''
+        values, order = read_values(fp)
+        if order != SORTED:
+            raise ValueError('the file does not hold sorted values')
+        return cls.from_sorted(values)
+
+
+    @classmethod
+    def _link_balanced(cls, nodes, lo, hi):
+        '''
+        Links nodes[lo:hi], which must be sorted by value, into a perfectly balanced tree and returns its root.
+        The middle node becomes the root and the two halves are linked recursively,
+        so the recursion is only O(log n) deep.
+        The nodes are reused rather than copied,
+        so anything else stored in them is kept.
+        '''
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = cls._link_balanced(nodes, lo, mid)
+        node.right = cls._link_balanced(nodes, mid + 1, hi)
+        cls._update(node)
+        return node
+
+
+    @staticmethod
+    def _make_node(value):
+        '''
+        Creates a node for the tree.
+        Subclasses that use their own kind of node override this.
+        '''
+        return BSTNode(value)
+
+
+    @classmethod
+    def _copy_node(cls, node):
+        '''
+        Creates a fresh node of this tree holding the same contents as node
+        (but none of its links).
+        '''
+        return cls._make_node(node.value)
+
+
+    @staticmethod
+    def _update(node):
+        '''
+        Called on a node after its children have been set,
+        so that the information cached in the node (here, the size of its subtree) can be refreshed.
+        Subclasses that cache more information extend this.
+        '''
+        if isinstance(node, BSTNode):
+            node.size = 1 + BST._get_size(node.left) + BST._get_size(node.right)
+
+
+    @staticmethod
+    def _get_size(node):
+        '''
+        Returns the number of nodes in the subtree below node.
+        This is O(1) for BSTNodes, which cache their size;
+        plain Nodes (for example trees wired up by hand) have their subtree counted instead.
+        '''
+        if node is None:
+            return 0
+        if isinstance(node, BSTNode):
+            return node.size
+        return sum(1 for _ in BinaryTree._preorder_nodes(node))
+
+
+    @staticmethod
+    def _is_sorted(xs):
+        return all(not b < a for a, b in zip(xs, xs[1:]))
+
+
+    @staticmethod
+    def _node_value(node):
+        return node.value
+
+
+    @staticmethod
+    def _unique_nodes(nodes):
+        '''
+        Yields the nodes of the iterable nodes (sorted by value),
+        skipping any node whose value equals the value of the node before it.
+        '''
+        previous = None
+        for node in nodes:
+            if previous is None or previous.value < node.value:
+                yield node
+                previous = node
+
+
+    @staticmethod
+    def _unique(xs):
+        '''
+        Yields the values of the sorted iterable xs, skipping repeated values.
+        '''
+        first = True
+        for x in xs:
+            if first or previous < x:
+                yield x
+            previous = x
+            first = False
+
+
     def is_bst_satisfied(self):
         '''
         Whenever you implement a data structure,
@@ -59,17 +231,19 @@ class BST(BinaryTree):
         If there is a node that has both a left and a right child,
         then the function will first recursively check the left node;
         then it returns before it checks the right node.
-        '''
-        left_valid = True
-        right_valid = True
 
-        if node.left:
-            left_valid = node.value > node.left.value and BST._is_bst_satisfied(node.left)
-
-        if node.right:
-            right_valid = node.value < node.right.value and BST._is_bst_satisfied(node.right)
-
-        return left_valid and right_valid
+        The check visits the nodes iteratively,
+        so that it also works on degenerate trees deeper than Python's recursion limit.
+        It also checks that the sizes cached in BSTNodes are correct.
+        '''
+        for node in BinaryTree._preorder_nodes(node):
+            if node.left and not node.value > node.left.value:
+                return False
+            if node.right and not node.value < node.right.value:
+                return False
+            if isinstance(node, BSTNode) and node.size != 1 + BST._get_size(node.left) + BST._get_size(node.right):
+                return False
+        return True
 
 
     def insert(self, value):
@@ -77,7 +251,7 @@ class BST(BinaryTree):
         Inserts value into the BST.
         '''
         if self.root is None:
-            self.root = Node(value)
+            self.root = BSTNode(value)
         else:
             BST._insert(value, self.root)
 
@@ -88,25 +262,53 @@ class BST(BinaryTree):
         Implement this function.
         The lecture videos have the exact code you need,
         except that their method is an instance method when it should have been a static method.
+
+        The lecture code is recursive;
+        this version walks down the tree in a loop instead,
+        so that inserting sorted input (which builds a degenerate tree) doesn't hit the recursion limit.
+        The nodes on the way down are remembered,
+        because each of their subtrees grows by one once the new node is attached.
         '''
-        if value < node.value:
-            if node.left is None:
-                node.left = Node(value)
-            else:
-                BST._insert(value, node.left)
-        elif value > node.value:
-            if node.right is None:
-                node.right = Node(value)
+        path = []
+        while True:
+            path.append(node)
+            if value < node.value:
+                if node.left is None:
+                    node.left = BSTNode(value)
+                    break
+                node = node.left
+            elif value > node.value:
+                if node.right is None:
+                    node.right = BSTNode(value)
+                    break
+                node = node.right
             else:
-                BST._insert(value, node.right)
-        else:
-            print("Value is already present in tree.")
+                print("Value is already present in tree.")
+                return
+        for node in path:
+            if isinstance(node, BSTNode):
+                node.size += 1
 
 
     def insert_list(self, xs):
         '''
         Given a list xs, insert each element of xs into self.
+
+        Inserting a sorted list one element at a time is the worst case for a BST
+        (each element becomes the right child of the one before, so it costs O(n^2)),
+        and it makes an AVLTree rotate at almost every step.
+        So when xs is a large sorted batch (at least as large as the tree),
+        it is merged with the sorted contents of the tree in O(n + m)
+        and the tree is rebuilt perfectly balanced instead.
         '''
+        xs = list(xs)
+        if len(xs) >= self._BULK_INSERT_THRESHOLD and BST._is_sorted(xs):
+            if self.root is None or len(xs) >= len(self):
+                new_nodes = (self._make_node(x) for x in BST._unique(xs))
+                merged = heapq.merge(BinaryTree._inorder_nodes(self.root), new_nodes, key=BST._node_value)
+                nodes = list(BST._unique_nodes(merged))
+                self.root = type(self)._link_balanced(nodes, 0, len(nodes))
+                return
         for x in xs:
             self.insert(x)
 
@@ -131,15 +333,110 @@ class BST(BinaryTree):
         Implement this function.
         The lecture videos have the exact code you need,
         except that their method is an instance method when it should have been a static method.
+        Like _insert, this is a loop rather than a recursion.
+        '''
+        return BST._find_node(value, node) is not None
+
+
+    @staticmethod
+    def _find_node(value, node):
+        '''
+        Returns the node below node (inclusive) that holds value,
+        or None if value is not in that subtree.
+        '''
+        while node is not None:
+            if value > node.value:
+                node = node.right
+            elif value < node.value:
+                node = node.left
+            else:
+                return node
+        return None
+
+
+    def floor(self, value):
+        '''
+        Returns the largest value in the tree that is smaller than or equal to value,
+        or None if there is no such value.
+        '''
+        return BST._closest(self.root, value, True, True)
+
+
+    def ceiling(self, value):
+        '''
+        Returns the smallest value in the tree that is larger than or equal to value,
+        or None if there is no such value.
+        '''
+        return BST._closest(self.root, value, False, True)
+
+
+    def predecessor(self, value):
+        '''
+        Returns the largest value in the tree that is strictly smaller than value,
+        or None if there is no such value.
+        value itself does not need to be in the tree.
+        '''
+        return BST._closest(self.root, value, True, False)
+
+
+    def successor(self, value):
         '''
-        if value > node.value and node.right:
-            return BST._find(value, node.right)
-        elif value < node.value and node.left:
-            return BST._find(value, node.left)
-        if value == node.value:
-            return True
+        Returns the smallest value in the tree that is strictly larger than value,
+        or None if there is no such value.
+        '''
+        return BST._closest(self.root, value, False, False)
 
 
+    @staticmethod
+    def _closest(node, value, below, inclusive):
+        '''
+        Walks down a single path from node looking for the closest value to value
+        that is below it (if below is True) or above it (otherwise),
+        and that may equal it only if inclusive is True.
+        Every candidate seen on the way down is closer than the one before,
+        so the last candidate is the answer.
+        '''
+        best = None
+        while node is not None:
+            if node.value < value:
+                if below:
+                    best = node.value
+                node = node.right
+            elif value < node.value:
+                if not below:
+                    best = node.value
+                node = node.left
+            else:   # node.value == value
+                if inclusive:
+                    return node.value
+                node = node.left if below else node.right
+        return best
+
+
+    def nearest(self, value, k):
+        '''
+        Returns the (up to) k values in the tree that are closest to value,
+        ordered from the closest to the furthest;
+        when two values are equally close, the smaller one comes first.
+        The values must support subtraction so that distances can be measured.
+
+        The values below and above value are read off lazily with irange and merged,
+        which costs O(height + k).
+        '''
+        below = self.irange(hi=value, reverse=True)
+        above = self.irange(lo=value, inclusive=(False, True))
+        missing = object()
+        b = next(below, missing)
+        a = next(above, missing)
+        result = []
+        while len(result) < k and (b is not missing or a is not missing):
+            if a is missing or (b is not missing and value - b <= a - value):
+                result.append(b)
+                b = next(below, missing)
+            else:
+                result.append(a)
+                a = next(above, missing)
+        return result
 
 
     def find_smallest(self):
@@ -161,10 +458,9 @@ class BST(BinaryTree):
 
     @staticmethod
     def _find_smallest(node):
-        if node.left is None:
-            return node.value
-        else:
-            return BST._find_smallest(node.left)
+        while node.left is not None:
+            node = node.left
+        return node.value
 
 
     def find_largest(self):
@@ -183,10 +479,9 @@ class BST(BinaryTree):
 
     @staticmethod
     def _find_largest(node):
-        if node.right is None:
-            return node.value
-        else:
-            return BST._find_largest(node.right)
+        while node.right is not None:
+            node = node.right
+        return node.value
 
 
     def remove(self,value):
@@ -208,29 +503,65 @@ class BST(BinaryTree):
 
     @staticmethod
     def _remove(node,value):
-        if node is None:
+        '''
+        Removes value from the subtree below node and returns the new root of the subtree.
+        The node to remove is found with a loop,
+        keeping track of the path down to it so that it can be unlinked without recursion,
+        and so that the cached sizes of the nodes on that path can be decremented.
+        '''
+        path = []
+        current = node
+        while current is not None:
+            if current.value > value:
+                path.append(current)
+                current = current.left
+            elif current.value < value:
+                path.append(current)
+                current = current.right
+            else:   # current.value == value
+                break
+        if current is None:
             return node
-        if node.value > value:
-            node.left = BST._remove(node.left, value)
-        elif node.value < value:
-            node.right = BST._remove(node.right, value)
-        else:   # node.value == value
-
-            # one child
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-
-            # two children
-            tmp = node.right
+
+        # two children
+        if current.left is not None and current.right is not None:
+            path.append(current)
+            tmp_parent = current
+            tmp = current.right
             while tmp.left:
-                tmp = tmp.left
-            node.value = tmp.value
-            node.right = BST._remove(node.right, node.value)
+                path.append(tmp)
+                tmp_parent, tmp = tmp, tmp.left
+            current.value = tmp.value
+            if tmp_parent is current:
+                tmp_parent.right = tmp.right
+            else:
+                tmp_parent.left = tmp.right
+            BST._shrink(path)
+            return node
+
+        # one child
+        child = current.left if current.left is not None else current.right
+        if not path:
+            return child
+        parent = path[-1]
+        if parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+        BST._shrink(path)
         return node
 
 
+    @staticmethod
+    def _shrink(path):
+        '''
+        Decrements the cached size of every node on path, after a node below them has been removed.
+        '''
+        for node in path:
+            if isinstance(node, BSTNode):
+                node.size -= 1
+
+
     def remove_list(self, xs):
         '''
         Given a list xs, remove each element of xs from self.
@@ -238,6 +569,252 @@ class BST(BinaryTree):
         for x in xs:
             self.remove(x)
 
+
+    def select(self, k):
+        '''
+        Returns the k-th smallest value in the tree (counting from 0),
+        so that select(k) == to_list('inorder')[k], including for negative k.
+        The cached subtree sizes tell us at every node whether the answer is to the left, here, or to the right,
+        so this is O(height) instead of O(n).
+        '''
+        size = len(self)
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError('select index out of range')
+        node = self.root
+        while True:
+            left_size = BST._get_size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+
+    def rank(self, value):
+        '''
+        Returns the number of values in the tree that are smaller than value.
+        value does not need to be in the tree.
+        If it is, then select(rank(value)) == value.
+        '''
+        return BST._count_below(self.root, value, False)
+
+
+    @staticmethod
+    def _count_below(node, value, inclusive):
+        '''
+        Counts the values below node that are smaller than value
+        (or smaller than or equal to value, if inclusive is True).
+        Whenever we step right, the node and its whole left subtree are counted in one go using the cached size.
+        '''
+        count = 0
+        while node is not None:
+            if node.value < value or (inclusive and not value < node.value):
+                count += BST._get_size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        '''
+        Yields the values v in the tree with lo <= v <= hi, in sorted order
+        (or in reverse sorted order if reverse is True).
+        Leaving lo or hi as None leaves that side of the range unbounded.
+        inclusive is a pair of booleans saying whether lo and hi themselves belong to the range.
+
+        Subtrees that lie entirely outside of the range are never entered,
+        so getting k values costs O(height + k) rather than the O(n) of filtering to_list('inorder').
+        '''
+        for node in BST._range_nodes(self.root, lo, hi, inclusive, reverse):
+            yield node.value
+
+
+    @staticmethod
+    def _range_nodes(node, lo, hi, inclusive, reverse):
+        '''
+        This is BinaryTree._inorder_nodes, except that it skips the children that cannot be in the range,
+        and stops as soon as it passes the end of the range.
+        When reverse is True, the roles of the left and right children are swapped.
+        '''
+        lo_inclusive, hi_inclusive = inclusive
+
+        def too_small(value):
+            if lo is None:
+                return False
+            return value < lo if lo_inclusive else not lo < value
+
+        def too_large(value):
+            if hi is None:
+                return False
+            return hi < value if hi_inclusive else not value < hi
+
+        if reverse:
+            skip_first, past_end = too_large, too_small
+        else:
+            skip_first, past_end = too_small, too_large
+
+        stack = []
+        while True:
+            while node is not None:
+                first, second = (node.right, node.left) if reverse else (node.left, node.right)
+                if skip_first(node.value):
+                    node = second
+                else:
+                    stack.append(node)
+                    node = first
+            if not stack:
+                return
+            node = stack.pop()
+            if past_end(node.value):
+                return
+            yield node
+            node = node.left if reverse else node.right
+
+
+    def count_range(self, lo=None, hi=None, inclusive=(True, True)):
+        '''
+        Returns the number of values that irange(lo, hi, inclusive) would yield.
+        Thanks to the cached subtree sizes this is O(height),
+        no matter how many values are in the range.
+        '''
+        lo_inclusive, hi_inclusive = inclusive
+        if hi is None:
+            count = len(self)
+        else:
+            count = BST._count_below(self.root, hi, hi_inclusive)
+        if lo is not None:
+            count -= BST._count_below(self.root, lo, not lo_inclusive)
+        return max(count, 0)
+
+
+    def median(self):
+        '''
+        Returns the median value of the tree.
+        When the tree has an even number of values, this is the lower of the two middle values
+        (the values need not be numbers, so they cannot be averaged).
+        '''
+        return self.select((len(self) - 1) // 2)
+
+
+    def percentile(self, p):
+        '''
+        Returns the p-th percentile of the values in the tree, for 0 <= p <= 100,
+        using the nearest-rank method:
+        the smallest value such that at least p percent of the values are no larger than it.
+        '''
+        if not 0 <= p <= 100:
+            raise ValueError('percentile must be between 0 and 100')
+        k = int(-(-p * len(self) // 100)) - 1
+        return self.select(max(k, 0))
+
+
+    def union(self, other):
+        '''
+        Returns a new tree holding every value that is in self or in other.
+        When a value is in both trees, the node of other is the one copied
+        (like dict's | operator, this matters only for subclasses whose nodes store more than a value).
+
+        Inserting the values of other one at a time would be O(m log(n+m)).
+        Instead, both trees are walked in order at the same time (like the merge step of merge sort),
+        which yields the result already sorted,
+        and the balanced result is linked up in one pass,
+        so the whole operation is O(n+m).
+        The same approach is used by intersection, difference, and symmetric_difference.
+        '''
+        return self._combine(other, lambda a, b: b if b is not None else a)
+
+
+    def intersection(self, other):
+        '''
+        Returns a new tree holding every value that is in both self and other.
+        '''
+        return self._combine(other, lambda a, b: a if b is not None else None)
+
+
+    def difference(self, other):
+        '''
+        Returns a new tree holding every value that is in self but not in other.
+        '''
+        return self._combine(other, lambda a, b: a if b is None else None)
+
+
+    def symmetric_difference(self, other):
+        '''
+        Returns a new tree holding every value that is in exactly one of self and other.
+        '''
+        return self._combine(other, lambda a, b: b if a is None else a if b is None else None)
+
+
+    def __or__(self, other):
+        if not isinstance(other, BST):
+            return NotImplemented
+        return self.union(other)
+
+
+    def __and__(self, other):
+        if not isinstance(other, BST):
+            return NotImplemented
+        return self.intersection(other)
+
+
+    def __sub__(self, other):
+        if not isinstance(other, BST):
+            return NotImplemented
+        return self.difference(other)
+
+
+    def __xor__(self, other):
+        if not isinstance(other, BST):
+            return NotImplemented
+        return self.symmetric_difference(other)
+
+
+    def _combine(self, other, pick):
+        '''
+        Walks self and other in order,
+        calls pick(a, b) on each pair of matching nodes (where a or b is None if the value is missing from that tree),
+        and returns a new tree of the same type as self holding copies of the nodes that pick returned.
+        '''
+        cls = type(self)
+        nodes = []
+        for a, b in BST._merge_inorder(self.root, other.root):
+            node = pick(a, b)
+            if node is not None:
+                nodes.append(cls._copy_node(node))
+        tree = cls()
+        tree.root = cls._link_balanced(nodes, 0, len(nodes))
+        return tree
+
+
+    @staticmethod
+    def _merge_inorder(left, right):
+        '''
+        Walks the trees rooted at left and right in order at the same time,
+        and yields a pair (a, b) for every value in either tree,
+        where a is the node of left holding the value (or None)
+        and b is the node of right holding the value (or None).
+        '''
+        xs = BinaryTree._inorder_nodes(left)
+        ys = BinaryTree._inorder_nodes(right)
+        a = next(xs, None)
+        b = next(ys, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and a.value < b.value):
+                yield a, None
+                a = next(xs, None)
+            elif a is None or b.value < a.value:
+                yield None, b
+                b = next(ys, None)
+            else:
+                yield a, b
+                a = next(xs, None)
+                b = next(ys, None)
+
 '''
 bst = BST()
 bst.insert(8)
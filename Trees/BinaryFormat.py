@@ -0,0 +1,96 @@
+'''
+This file implements the compact binary file format used by the dump and load functions of the trees.
+
+A file starts with a 16 byte header:
+
+    4 bytes   the magic string b'TREE'
+    1 byte    the format version (currently 1)
+    1 byte    the order of the values: b'S' for sorted, b'L' for level order (the order of a Heap's list)
+    1 byte    how the values are stored: b'q' for int64, b'd' for float64, b'p' for pickle
+    1 byte    padding
+    8 bytes   the number of values (unsigned, little endian)
+
+If every value is an int that fits in 64 bits (or every value is a float),
+the values follow as a packed little endian array of 8 byte numbers,
+so a file of n values is 16 + 8n bytes and can be read back without parsing anything.
+Any other kind of value is stored as a pickled list instead.
+The header is 16 bytes so that the packed array is 8 byte aligned,
+which lets MappedTree use it in place.
+'''
+
+import array
+import pickle
+import struct
+import sys
+
+MAGIC = b'TREE'
+VERSION = 1
+SORTED = b'S'
+LEVELORDER = b'L'
+INT64 = b'q'
+FLOAT64 = b'd'
+PICKLE = b'p'
+
+HEADER = struct.Struct('<4sBccxQ')
+
+
+def _typecode(values):
+    '''
+    Returns the most compact way of storing values.
+    '''
+    if all(type(v) is int and -2**63 <= v < 2**63 for v in values):
+        return INT64
+    if all(type(v) is float for v in values):
+        return FLOAT64
+    return PICKLE
+
+
+def write_values(fp, values, order):
+    '''
+    Writes the list values to the binary file object fp.
+    order must be SORTED or LEVELORDER; it is recorded in the header but not checked.
+    '''
+    typecode = _typecode(values)
+    fp.write(HEADER.pack(MAGIC, VERSION, order, typecode, len(values)))
+    if typecode == PICKLE:
+        pickle.dump(list(values), fp, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        packed = array.array(typecode.decode(), values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        fp.write(packed.tobytes())
+
+
+def read_header(buffer):
+    '''
+    Parses the header at the start of buffer and returns (order, typecode, count).
+    Raises a ValueError if buffer does not start with a valid header.
+    '''
+    if len(buffer) < HEADER.size:
+        raise ValueError('not a tree file: too short')
+    magic, version, order, typecode, count = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError('not a tree file')
+    if version != VERSION:
+        raise ValueError('unsupported tree file version '+str(version))
+    return order, typecode, count
+
+
+def read_values(fp):
+    '''
+    Reads values written by write_values from the binary file object fp.
+    Returns (values, order), where values is a list.
+    '''
+    order, typecode, count = read_header(fp.read(HEADER.size))
+    if typecode == PICKLE:
+        values = pickle.load(fp)
+    else:
+        values = array.array(typecode.decode())
+        data = fp.read(count * values.itemsize)
+        if len(data) != count * values.itemsize:
+            raise ValueError('tree file is truncated')
+        values.frombytes(data)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        values = values.tolist()
+    return values, order
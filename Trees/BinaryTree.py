@@ -4,27 +4,32 @@ These two classes are the building blocks for the BST, AVLTree, and Heap data st
 It is crucial to get these implemented correctly in order to be able to implement the other data structures.
 '''
 
+import itertools
+from collections import deque
+
 class Queue(object):
     '''
     Level order traversal -> queue
-    built on in-built list
+    built on collections.deque,
+    which adds and removes items at either end in O(1)
+    (inserting at the front of a list is O(n), which made level order traversals quadratic)
     '''
     def __init__(self):
-        self.items = []
+        self.items = deque()
 
     def enqueue(self, item):
-        self.items.insert(0, item)
+        self.items.append(item)
 
     def dequeue(self):
         if not self.is_empty():
-            return self.items.pop()
+            return self.items.popleft()
 
     def is_empty(self):
         return len(self.items) == 0
 
     def peek(self):
         if not self.is_empty():
-            return self.items[-1].value
+            return self.items[0].value
 
     def __len__(self):
         return self.size()
@@ -35,9 +40,10 @@ class Queue(object):
 class Stack(object):
     '''
     Reverse level order traversal -> stack and queue
+    built on collections.deque, like the Queue
     '''
     def __init__(self):
-        self.items = []
+        self.items = deque()
 
     def __len__(self):
         return self.size()
@@ -60,10 +66,7 @@ class Stack(object):
         return len(self.items) == 0
 
     def __str__(self):
-        s = ""
-        for i in range(len(self.items)):
-            s += str(self.items[i].value) + "-"
-        return s
+        return ''.join(str(item.value) + "-" for item in self.items)
 
 class Node():
     '''
@@ -71,25 +74,50 @@ class Node():
     Given a node t, you can visualize the node by running str(t) in the python interpreter.
     This is a key method to perform debugging,
     so you should get familiar with how to visualize these strings.
+
+    Nodes declare __slots__ so that they don't each carry an attribute dictionary,
+    which roughly halves the memory used per node.
+    Subclasses that need extra fields (like the AVLNode's cached height) must declare them in their own __slots__.
     '''
+    __slots__ = ('value', 'left', 'right')
+
     def __init__(self,value):
         self.value = value
         self.left = None
         self.right = None
 
     def __str__(self):
-        ret = '('
-        ret += str(self.value)
-        ret += ' - '
-        if self.left:
-            ret += str(self.left)
-            ret += ' '
-        ret += '- '
-        if self.right:
-            ret += str(self.right)
-            ret += ' '
-        ret += ')'
-        return ret
+        '''
+        The string has the form (value - left - right ),
+        where left and right are the strings of the children (and are omitted when a child is missing).
+        '''
+        return ''.join(Node._str_pieces(self))
+
+    @staticmethod
+    def _str_pieces(node):
+        '''
+        Yields the pieces of str(node) in order.
+        Building the string recursively would copy each subtree's string once per level above it,
+        which is quadratic for deep trees (and overflows the stack);
+        instead, the pieces are generated with an explicit stack and joined once at the end.
+        '''
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, Node):
+                yield item
+                continue
+            stack.append(')')
+            if item.right:
+                stack.append(' ')
+                stack.append(item.right)
+            stack.append('- ')
+            if item.left:
+                stack.append(' ')
+                stack.append(item.left)
+            stack.append(' - ')
+            stack.append(str(item.value))
+            stack.append('(')
 
 class BinaryTree():
     '''
@@ -138,38 +166,56 @@ class BinaryTree():
         else:
             raise ValueError('Traversal type ' + str(traversal_type) + ' is not supported.')
 
+    def write_tree(self, fp, traversal_type):
+        '''
+        Writes the string that print_tree would return to the file object fp.
+        The string is never built in full:
+        the values are rendered and written a chunk at a time as the traversal proceeds,
+        so even very large trees can be dumped to a log with little memory.
+        '''
+        if traversal_type == 'preorder':
+            nodes = BinaryTree._preorder_nodes(self.root)
+        elif traversal_type == 'inorder':
+            nodes = BinaryTree._inorder_nodes(self.root)
+        elif traversal_type == 'postorder':
+            nodes = BinaryTree._postorder_nodes(self.root)
+        elif traversal_type == 'levelorder':
+            nodes = BinaryTree._levelorder_nodes(self.root)
+        elif traversal_type == "reverse_levelorder":
+            nodes = BinaryTree._reverse_levelorder_nodes(self.root)
+        else:
+            raise ValueError('Traversal type ' + str(traversal_type) + ' is not supported.')
+
+        pieces = (str(node.value) + '-' for node in nodes)
+        while True:
+            chunk = ''.join(itertools.islice(pieces, 4096))
+            if not chunk:
+                break
+            fp.write(chunk)
+
     def preorder_print(self, start, traversal):
         '''
         Root -> Left -> Right
         1-2-4-5-3-6-7
+
+        All of the _print functions render the values and join them in a single pass;
+        appending to the string one value at a time would copy it over and over.
         '''
-        if start:
-            traversal += (str(start.value) + '-')
-            traversal = self.preorder_print(start.left, traversal)
-            traversal = self.preorder_print(start.right, traversal)
-        return traversal
+        return traversal + ''.join(str(node.value) + '-' for node in BinaryTree._preorder_nodes(start))
 
     def inorder_print(self, start, traversal):
         '''
         Left -> Root -> Right
         4-2-5-1-6-3-7
         '''
-        if start:
-            traversal = self.inorder_print(start.left, traversal)
-            traversal += (str(start.value) + '-')
-            traversal = self.inorder_print(start.right, traversal)
-        return traversal
+        return traversal + ''.join(str(node.value) + '-' for node in BinaryTree._inorder_nodes(start))
 
     def postorder_print(self, start, traversal):
         '''
         Left -> Right -> Root
         4-2-5-6-3-7-1
         '''
-        if start:
-            traversal = self.postorder_print(start.left, traversal)
-            traversal = self.postorder_print(start.right, traversal)
-            traversal += (str(start.value) + '-')
-        return traversal
+        return traversal + ''.join(str(node.value) + '-' for node in BinaryTree._postorder_nodes(start))
 
     def levelorder_print(self, start):
         '''
@@ -179,18 +225,7 @@ class BinaryTree():
         if start is None:
             return
 
-        queue = Queue()
-        queue.enqueue(start)
-        traversal = ""
-
-        while len(queue) > 0:
-            traversal += str(queue.peek()) + "-"
-            node = queue.dequeue()
-            if node.left:
-                queue.enqueue(node.left)
-            if node.right:
-                queue.enqueue(node.right)
-        return traversal
+        return ''.join(str(node.value) + "-" for node in BinaryTree._levelorder_nodes(start))
 
     def reverse_levelorder_print(self, start):
         '''
@@ -199,24 +234,41 @@ class BinaryTree():
         if start is None:
             return
 
-        queue = Queue()
-        stack = Stack()
-        queue.enqueue(start)
-        traversal = ""
+        return ''.join(str(node.value) + "-" for node in BinaryTree._reverse_levelorder_nodes(start))
 
-        while len(queue) > 0:
-            node = queue.dequeue()
-            stack.push(node)
-            if node.right: #right child first
-                queue.enqueue(node.right)
-            if node.left:
-                queue.enqueue(node.left)
+    def __iter__(self):
+        '''
+        Iterating over a tree yields its values in inorder.
+        For a BST or AVLTree this is sorted order,
+        so next(iter(tree)) returns the smallest value after walking down a single path of the tree.
+        '''
+        return self.iter_inorder()
 
-        while len(stack) > 0:
-            node = stack.pop()
-            traversal += str(node.value) + "-"
+    def iter_preorder(self):
+        '''
+        The iter_ functions are lazy versions of to_list:
+        they yield one value at a time instead of building the whole list up front,
+        so the caller can stop early or stream a large tree into something else.
+        The depth-first orders keep only O(height) nodes in memory at a time.
+        '''
+        for node in BinaryTree._preorder_nodes(self.root):
+            yield node.value
 
-        return traversal
+    def iter_inorder(self):
+        for node in BinaryTree._inorder_nodes(self.root):
+            yield node.value
+
+    def iter_postorder(self):
+        for node in BinaryTree._postorder_nodes(self.root):
+            yield node.value
+
+    def iter_levelorder(self):
+        '''
+        Level order has to remember a whole level of the tree at a time,
+        so this uses O(width) rather than O(height) memory.
+        '''
+        for node in BinaryTree._levelorder_nodes(self.root):
+            yield node.value
 
     def to_list(self, traversal_type):
         '''
@@ -237,6 +289,10 @@ class BinaryTree():
             return self.inorder(self.root, [])
         elif traversal_type == 'postorder':
             return self.postorder(self.root, [])
+        elif traversal_type == 'levelorder':
+            return self.levelorder(self.root, [])
+        elif traversal_type == 'reverse_levelorder':
+            return self.reverse_levelorder(self.root, [])
         else:
             raise ValueError('traversal_type=' + str(traversal_type) + ' is not supported.')
 
@@ -244,32 +300,126 @@ class BinaryTree():
         '''
         Implement this function by modifying the _print functions above.
         '''
-        if start:
-            traversal.append(start.value)
-            traversal = self.preorder(start.left, traversal)
-            traversal = self.preorder(start.right, traversal)
+        traversal.extend(node.value for node in BinaryTree._preorder_nodes(start))
         return traversal
 
     def inorder(self, start, traversal):
         '''
         Implement this function by modifying the _print functions above.
         '''
-        if start:
-            traversal = self.inorder(start.left, traversal)
-            traversal.append(start.value)
-            traversal = self.inorder(start.right, traversal)
+        traversal.extend(node.value for node in BinaryTree._inorder_nodes(start))
         return traversal
 
     def postorder(self, start, traversal):
         '''
         Implement this function by modifying the _print functions above.
         '''
-        if start:
-            traversal = self.postorder(start.left, traversal)
-            traversal = self.postorder(start.right, traversal)
-            traversal.append(start.value)
+        traversal.extend(node.value for node in BinaryTree._postorder_nodes(start))
+        return traversal
+
+    def levelorder(self, start, traversal):
+        traversal.extend(node.value for node in BinaryTree._levelorder_nodes(start))
         return traversal
 
+    def reverse_levelorder(self, start, traversal):
+        traversal.extend(node.value for node in BinaryTree._reverse_levelorder_nodes(start))
+        return traversal
+
+    @staticmethod
+    def _preorder_nodes(start):
+        '''
+        Yields the nodes below start in preorder.
+        This and the two functions below walk the tree with an explicit stack instead of recursion,
+        so they work on trees of any depth
+        (a recursive traversal of a degenerate tree with more than ~1000 nodes hits Python's recursion limit)
+        and they avoid the cost of a Python function call per node.
+        '''
+        stack = []
+        if start is not None:
+            stack.append(start)
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    @staticmethod
+    def _inorder_nodes(start):
+        '''
+        Yields the nodes below start in inorder.
+        '''
+        stack = []
+        node = start
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    @staticmethod
+    def _postorder_nodes(start):
+        '''
+        Yields the nodes below start in postorder.
+        Each node is pushed twice:
+        the first time it is popped its children get pushed,
+        and the second time it is popped it gets yielded.
+        '''
+        stack = [(start, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node is None:
+                continue
+            if children_done:
+                yield node
+            else:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+
+    @staticmethod
+    def _levelorder_nodes(start):
+        '''
+        Yields the nodes below start one level at a time, from left to right.
+        '''
+        if start is None:
+            return
+        queue = Queue()
+        queue.enqueue(start)
+        while len(queue) > 0:
+            node = queue.dequeue()
+            yield node
+            if node.left:
+                queue.enqueue(node.left)
+            if node.right:
+                queue.enqueue(node.right)
+
+    @staticmethod
+    def _reverse_levelorder_nodes(start):
+        '''
+        Yields the nodes below start from the bottom level up,
+        and from left to right within each level.
+        The nodes are visited in level order with the right child first and pushed onto a stack,
+        so popping the stack gives them back in reverse.
+        '''
+        if start is None:
+            return
+        queue = Queue()
+        stack = Stack()
+        queue.enqueue(start)
+        while len(queue) > 0:
+            node = queue.dequeue()
+            stack.push(node)
+            if node.right: #right child first
+                queue.enqueue(node.right)
+            if node.left:
+                queue.enqueue(node.left)
+        while len(stack) > 0:
+            yield stack.pop()
+
     def __len__(self):
         '''
         The lecture notes videos provide a recursive and an iterative version of a "size" function
@@ -284,30 +434,21 @@ class BinaryTree():
         '''
         Iterative function for size of the tree
         '''
-        if self.root is None:
-            return 0
-
-        stack = Stack()
-        stack.push(self.root)
-        size = 1
-
-        while stack:
-            node = stack.pop()
-            if node.left:
-                size += 1
-                stack.push(node.left)
-            if node.right:
-                size += 1
-                stack.push(node.right)
-        return size
+        return self.size_(self.root)
 
     def size_(self, node):
         '''
-        Recursive function for size of the tree
+        Iterative function for size of the subtree below node.
+        This used to be recursive,
+        which fails with a RecursionError on degenerate trees deeper than Python's recursion limit.
+        Like _height, it counts the nodes one level at a time.
         '''
-        if node is None:
-            return 0
-        return 1 + self.size_(node.left) + self.size_(node.right)
+        size = 0
+        level = [node] if node is not None else []
+        while level:
+            size += len(level)
+            level = [child for parent in level for child in (parent.left, parent.right) if child is not None]
+        return size
 
     def height(self):
         return BinaryTree._height(self.root)
@@ -320,12 +461,16 @@ class BinaryTree():
         and so the self argument is passed in as the first argument of height.
         This makes it inconvenient to use,
         and so you should implement it as a static method.
+
+        The height is computed iteratively one level at a time,
+        so it works on trees of any depth.
         '''
-        if node is None:
-            return -1
-        left_height = BinaryTree._height(node.left)
-        right_height = BinaryTree._height(node.right)
-        return 1 + max(left_height, right_height)
+        height = -1
+        level = [node] if node is not None else []
+        while level:
+            height += 1
+            level = [child for parent in level for child in (parent.left, parent.right) if child is not None]
+        return height
 
 '''
 # Set up tree:
@@ -0,0 +1,228 @@
+'''
+This file implements a wrapper that makes the trees in this package safe to share between threads.
+'''
+
+import contextlib
+import threading
+import types
+
+
+class ReadWriteLock:
+    '''
+    A readers-writer lock:
+    any number of threads may hold the lock for reading at the same time,
+    but a thread holding the lock for writing excludes every other thread.
+
+    Once a writer is waiting, newly arriving readers wait behind it,
+    so a steady stream of readers cannot starve the writers.
+    Readers that were already waiting when a writer releases the lock go ahead of the next writer,
+    so a steady stream of writers cannot starve the readers either.
+    The lock is not reentrant.
+
+    Only threading.Condition is used, so the lock does not depend on the GIL
+    and works the same on free-threaded builds of CPython.
+    '''
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._writes = 0
+
+    def acquire_read(self):
+        with self._cond:
+            writes = self._writes
+            while self._writer or (self._writers_waiting and self._writes == writes):
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._writes += 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentTree:
+    '''
+    Wraps a BST, AVLTree, Heap (or any other tree in this package) so that it can be shared between threads.
+
+    Every function of the wrapped tree can be called on the wrapper.
+    The functions that only read the tree (find, select, irange, ...) take the lock for reading,
+    so they run in parallel with each other;
+    every other function takes the lock for writing, so writes are serialized.
+    (A function that is not known to be read-only is treated as a write, which is always safe.)
+    Functions that return a generator, like irange, return a list instead,
+    because a generator would keep reading the tree after the lock is released.
+
+    The set operations (union, intersection, difference, symmetric_difference, and | & - ^)
+    also take the lock of other for reading when other is a ConcurrentTree too,
+    so neither tree can change while the two are walked.
+    Attributes that are not functions (like root) are not exposed,
+    because their nodes would be read after the lock is released;
+    use reading() instead.
+
+    A single insert_list or remove_list holds the lock once for the whole batch.
+    To group several different calls under one acquisition of the lock, use
+    `with wrapper.writing() as tree:` (or `reading()`), which gives direct access to the wrapped tree.
+    '''
+
+    _READS = frozenset([
+        'find', 'find_smallest', 'find_largest',
+        'floor', 'ceiling', 'predecessor', 'successor', 'nearest',
+        'select', 'rank', 'irange', 'count_range', 'median', 'percentile',
+        'get', 'keys', 'values', 'items',
+        'to_list', 'iter_preorder', 'iter_inorder', 'iter_postorder', 'iter_levelorder',
+        'height', 'size', 'print_tree', 'write_tree',
+        'is_bst_satisfied', 'is_avl_satisfied', 'is_heap_satisfied', 'balance_factor',
+    ])
+
+    _SET_OPERATIONS = frozenset([
+        'union', 'intersection', 'difference', 'symmetric_difference',
+    ])
+
+    def __init__(self, tree):
+        self._tree = tree
+        self._lock = ReadWriteLock()
+
+    def __repr__(self):
+        with self._lock.read():
+            return type(self).__name__+'('+repr(self._tree)+')'
+
+    def __getattr__(self, name):
+        with self._lock.read():
+            function = getattr(self._tree, name)
+        if not callable(function):
+            raise AttributeError(
+                type(self).__name__+' does not expose '+repr(name)+'; use reading() to access it')
+        if name in self._SET_OPERATIONS:
+            return lambda other: self._combine(name, other)
+        if name in self._READS:
+            acquire, release = self._lock.acquire_read, self._lock.release_read
+        else:
+            acquire, release = self._lock.acquire_write, self._lock.release_write
+
+        def locked(*args, **kwargs):
+            acquire()
+            try:
+                result = function(*args, **kwargs)
+                if isinstance(result, types.GeneratorType):
+                    result = list(result)
+                return result
+            finally:
+                release()
+        return locked
+
+    def _combine(self, name, other):
+        '''
+        Calls the function name of the wrapped tree on other
+        while holding the read locks of both self and other.
+        '''
+        with self._reading_with(other) as other:
+            return getattr(self._tree, name)(other)
+
+    @contextlib.contextmanager
+    def _reading_with(self, other):
+        '''
+        Holds the lock of self for reading, and the lock of other too if other is a ConcurrentTree,
+        and gives access to the tree that other wraps (or other itself if it is not wrapped).
+        The two locks are always taken in the order of id(), so that a thread running a | b
+        and another thread running b | a cannot deadlock;
+        a tree combined with itself takes its lock only once, since the lock is not reentrant.
+        '''
+        if not isinstance(other, ConcurrentTree):
+            with self._lock.read():
+                yield other
+        elif other is self:
+            with self._lock.read():
+                yield self._tree
+        else:
+            first, second = sorted([self, other], key=id)
+            with first._lock.read(), second._lock.read():
+                yield other._tree
+
+    def __or__(self, other):
+        return self._combine('__or__', other)
+
+    def __and__(self, other):
+        return self._combine('__and__', other)
+
+    def __sub__(self, other):
+        return self._combine('__sub__', other)
+
+    def __xor__(self, other):
+        return self._combine('__xor__', other)
+
+    @contextlib.contextmanager
+    def reading(self):
+        '''
+        Holds the lock for reading and gives access to the wrapped tree.
+        The tree must not be modified inside the with block.
+        '''
+        with self._lock.read():
+            yield self._tree
+
+    @contextlib.contextmanager
+    def writing(self):
+        '''
+        Holds the lock for writing and gives access to the wrapped tree,
+        so that a batch of changes is made with a single acquisition of the lock
+        and no reader ever sees the batch half done.
+        '''
+        with self._lock.write():
+            yield self._tree
+
+    def __len__(self):
+        with self._lock.read():
+            return len(self._tree)
+
+    def __contains__(self, value):
+        with self._lock.read():
+            return value in self._tree
+
+    def __iter__(self):
+        with self._lock.read():
+            return iter(list(self._tree))
+
+    def __getitem__(self, key):
+        with self._lock.read():
+            return self._tree[key]
+
+    def __setitem__(self, key, value):
+        with self._lock.write():
+            self._tree[key] = value
+
+    def __delitem__(self, key):
+        with self._lock.write():
+            del self._tree[key]
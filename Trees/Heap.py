@@ -1,13 +1,67 @@
 from Trees.BinaryTree import BinaryTree, Node
+from Trees.BinaryFormat import write_values, read_values, LEVELORDER
+
+
+class _ReverseKey:
+    '''
+    Wraps a key so that larger keys compare as smaller,
+    which turns the min-heap into a max-heap without requiring the keys to be numbers.
+    '''
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
 
 class Heap(BinaryTree):
+    '''
+    A binary min-heap.
+
+    The heap is a complete binary tree,
+    and a complete binary tree can be stored in a list in level order without any pointers:
+    the children of the value at index i are at indices 2*i+1 and 2*i+2,
+    and its parent is at index (i-1)//2.
+    So internally the heap is just a list,
+    which makes insert and remove_min O(log n) with no per-node allocations,
+    and lets Heap(xs) be built in O(n).
+
+    The Heap is still a BinaryTree.
+    Reading self.root gives a tree of Nodes that mirrors the list,
+    so to_list, print_tree, height, and the other BinaryTree functions all keep working.
+    That tree is a snapshot built on demand;
+    changing its nodes does not change the heap.
+    Assigning a tree to self.root replaces the contents of the heap with that tree,
+    which is how the test cases build heaps by hand.
 
-    def __init__(self, xs=None):
+    Like sorted, the heap takes an optional key function and a reverse flag:
+    values are ordered by key(value), and reverse=True makes it a max-heap
+    (so find_smallest and remove_min return the largest value).
+    The key of every value is computed once, when the value is inserted,
+    and is stored in a second list _keys that is kept parallel to _items.
+    (Without a key function, _keys is simply the same list as _items.)
+
+    The heap can also be d-ary instead of binary:
+    with arity=d, the children of index i are at indices d*i+1 through d*i+d.
+    A larger arity makes the heap shallower, so insert does fewer comparisons
+    and each level of remove_min scans d children that sit next to each other in the list.
+    A d-ary heap is not a binary tree, so self.root (and the BinaryTree functions built on it)
+    only works when arity is 2.
+    '''
+
+    def __init__(self, xs=None, key=None, reverse=False, arity=2):
         '''
         FIXME:
         If xs is a list (i.e. xs is not None),
         then each element of xs needs to be inserted into the Heap.
         '''
+        if not isinstance(arity, int) or arity < 2:
+            raise ValueError('arity must be an integer of at least 2')
+        self._key = key
+        self._reverse = reverse
+        self._arity = arity
         super().__init__()
         if xs:
             self.insert_list(xs)
@@ -24,8 +78,127 @@ class Heap(BinaryTree):
         but for the AVLTree, this expression will be "AVLTree".
         Using this expression ensures that all subclasses of Heap will have a correct implementation of __repr__,
         and that they won't have to reimplement it.
+
+        The values are listed in level order (the order of the underlying list),
+        because building a heap from a list that is already a valid heap leaves the list unchanged.
+        A key function cannot be written as a string, so it is left out.
+        '''
+        if self._tree is not None:
+            values = self.to_list('levelorder')
+        else:
+            values = list(self._items)
+        args = [str(values)]
+        if self._reverse:
+            args.append('reverse=True')
+        if self._arity != 2:
+            args.append('arity='+str(self._arity))
+        return type(self).__name__+'('+', '.join(args)+')'
+
+
+    @property
+    def root(self):
+        if self._tree is not None:
+            return self._tree
+        if self._arity != 2:
+            raise TypeError('a heap with arity '+str(self._arity)+' is not a binary tree')
+        if self._view is None and self._items:
+            self._view = Heap._build_view(self._items)
+        return self._view
+
+
+    @root.setter
+    def root(self, node):
+        self._items = []
+        self._keys = [] if self._keyed() else self._items
+        self._tree = node
+        self._view = None
+
+
+    @staticmethod
+    def _build_view(items):
+        '''
+        Builds a tree of Nodes with the same shape and values as the list items.
+        '''
+        nodes = [Node(value) for value in items]
+        for i in range(len(nodes) // 2):
+            left = 2 * i + 1
+            nodes[i].left = nodes[left]
+            if left + 1 < len(nodes):
+                nodes[i].right = nodes[left + 1]
+        return nodes[0]
+
+
+    def _sync(self):
+        '''
+        If a tree was assigned to self.root by hand,
+        this copies its values into the list (restoring the heap property if necessary).
+        Every function that modifies the heap calls this first.
+        '''
+        if self._tree is not None:
+            self._items = [node.value for node in BinaryTree._levelorder_nodes(self._tree)]
+            self._keys = [self._make_key(x) for x in self._items] if self._keyed() else self._items
+            self._tree = None
+            self._heapify_self()
+        self._view = None
+
+
+    def _keyed(self):
+        '''
+        Returns whether the keys are different from the values (and so need a list of their own).
+        '''
+        return self._key is not None or self._reverse
+
+
+    def _make_key(self, value):
+        key = value if self._key is None else self._key(value)
+        return _ReverseKey(key) if self._reverse else key
+
+
+    def __len__(self):
+        if self._tree is not None:
+            return super().__len__()
+        return len(self._items)
+
+
+    def __str__(self):
+        '''
+        A d-ary heap has no tree of Nodes to print,
+        so its string is the underlying list (in level order) instead.
+        '''
+        if self._arity != 2 and self._tree is None:
+            return str(self._items)
+        return super().__str__()
+
+
+    def __iter__(self):
         '''
-        return type(self).__name__+'('+str(self.to_list('inorder'))+')'
+        Like __str__, iterating over a d-ary heap yields the values of the underlying list in level order.
+        '''
+        if self._arity != 2 and self._tree is None:
+            return iter(self._items)
+        return super().__iter__()
+
+
+    def dump(self, fp):
+        '''
+        Writes the heap to the binary file object fp (see BinaryFormat.py for the format).
+        The list is written as it is, in level order.
+        '''
+        self._sync()
+        write_values(fp, self._items, LEVELORDER)
+
+
+    @classmethod
+    def load(cls, fp, key=None, reverse=False, arity=2):
+        '''
+        Reads a heap written by dump (or any file in the same format, such as one written by BST.dump) from fp.
+        The list is heapified in O(n), which does nothing if it is already a heap.
+        The key function is not stored in the file, so it (and reverse and arity) must be passed again.
+        '''
+        values, order = read_values(fp)
+        heap = cls(key=key, reverse=reverse, arity=arity)
+        heap.insert_list(values)
+        return heap
 
 
     def is_heap_satisfied(self):
@@ -36,138 +209,282 @@ class Heap(BinaryTree):
         This makes it possible to automatically test whether insert/delete functions
         are actually working.
         '''
-        if self.root:
-            return Heap._is_heap_satisfied(self.root)
-        return True
+        if self._tree is not None:
+            return Heap._is_heap_satisfied(self._tree, self._make_key)
+        keys = self._keys
+        d = self._arity
+        return all(not keys[i] < keys[(i - 1) // d] for i in range(1, len(keys)))
 
 
     @staticmethod
-    def _is_heap_satisfied(node):
+    def _is_heap_satisfied(node, key=None):
+        '''
+        Checks a tree of Nodes (rather than the list) iteratively.
+        If key is given, the nodes are compared by key(value) the same way the list is compared,
+        so a hand-built tree is checked with the heap's own key and reverse.
+        '''
+        if key is None:
+            key = lambda value: value
+        for node in BinaryTree._preorder_nodes(node):
+            if node.left and key(node.left.value) < key(node.value):
+                return False
+            if node.right and key(node.right.value) < key(node.value):
+                return False
+        return True
 
-        is_left_satisfied = True
-        is_right_satisfied = True
 
-        if node is None:
-            return True
+    def insert(self, value):
+        '''
+        Inserts value into the heap.
+        The value is appended to the end of the list
+        and then swapped up towards the root until its parent is no larger than it.
+        '''
+        self._sync()
+        self._items.append(value)
+        if self._keys is not self._items:
+            self._keys.append(self._make_key(value))
+        self._sift_up_self(len(self._items) - 1)
 
-        if node.left:
-            is_left_satisfied = node.left.value >= node.value and Heap._is_heap_satisfied(node.left)
 
-        if node.right:
-            is_right_satisfied = node.right.value >= node.value and Heap._is_heap_satisfied(node.right)
+    def insert_list(self, xs):
+        '''
+        Given a list xs, insert each element of xs into self.
+        When xs is at least as large as the heap itself,
+        it is cheaper to append everything and rebuild the heap in O(n)
+        than to insert the elements one at a time in O(log n) each.
+        '''
+        self._sync()
+        xs = list(xs)
+        if len(xs) >= len(self._items):
+            self._items.extend(xs)
+            if self._keys is not self._items:
+                self._keys.extend(self._make_key(x) for x in xs)
+            self._heapify_self()
+        else:
+            for x in xs:
+                self.insert(x)
 
-        return is_right_satisfied and is_left_satisfied
 
+    def find_smallest(self):
+        '''
+        Returns the smallest value in the tree
+        (by key, and the largest one if reverse is True).
+        '''
+        if self._tree is not None:
+            return self._tree.value
+        if self._items:
+            return self._items[0]
 
-    def insert(self, value):
+
+    def remove_min(self):
         '''
-        Inserts value into the heap.
+        Removes the minimum value from the Heap and returns it.
+        If the heap is empty, it does nothing.
+        The last value in the list takes the place of the root
+        and is then swapped down until both of its children are no smaller than it.
+        '''
+        self._sync()
+        items = self._items
+        keys = self._keys
+        if not items:
+            return None
+        last = items.pop()
+        if keys is not items:
+            last_key = keys.pop()
+        if not items:
+            return last
+        smallest = items[0]
+        items[0] = last
+        if keys is not items:
+            keys[0] = last_key
+        self._sift_down_self(0)
+        return smallest
+
+
+    def pushpop(self, value):
+        '''
+        Inserts value and then removes and returns the minimum value,
+        which is faster than calling insert and then remove_min.
+        If value is no larger than the current minimum, the heap is not changed at all and value is returned;
+        otherwise value takes the place of the minimum and is sifted down once.
+        '''
+        self._sync()
+        items = self._items
+        keys = self._keys
+        key = self._make_key(value) if keys is not items else value
+        if not items or not keys[0] < key:
+            return value
+        smallest = items[0]
+        items[0] = value
+        if keys is not items:
+            keys[0] = key
+        self._sift_down_self(0)
+        return smallest
+
+
+    def replace(self, value):
+        '''
+        Removes and returns the minimum value and then inserts value,
+        with a single sift down.
+        Unlike pushpop, the returned value may be larger than value.
+        If the heap is empty, value is just inserted and None is returned.
+        '''
+        self._sync()
+        items = self._items
+        if not items:
+            self.insert(value)
+            return None
+        smallest = items[0]
+        items[0] = value
+        if self._keys is not items:
+            self._keys[0] = self._make_key(value)
+        self._sift_down_self(0)
+        return smallest
+
+
+    def _sift_up_self(self, pos):
         '''
-        if self.root is None:
-            self.root = Node(value)
-            self.root.descendents = 1
+        Sifts up the entry at pos with whichever sift function fits this heap:
+        the plain binary heap uses the faster functions that only move one list.
+        '''
+        if self._arity == 2 and self._keys is self._items:
+            Heap._sift_up(self._items, pos)
         else:
-            Heap._insert(value, self.root)
+            Heap._sift_up_keyed(self._keys, self._items, pos, self._arity)
 
 
-    @staticmethod
-    def _insert(value, node):
-        '''
-        use binary representation of total nodes to determine which subtree to go
-        '''
-        node.descendents += 1
-        binary = "{0:b}".format(node.descendents)
-        if binary[1] == '0':
-            if node.left is None:
-                node.left = Node(value)
-                node.left.descendents = 1
-            else:
-                Heap._insert(value,node.left)
-            if node.value > node.left.value:
-                node.value, node.left.value = node.left.value, node.value
-        elif binary[1] == '1':
-            if node.right is None:
-                node.right = Node(value)
-                node.right.descendents = 1
-            else:
-                Heap._insert(value,node.right)
-            if node.value > node.right.value:
-                node.value, node.right.value = node.right.value, node.value
+    def _sift_down_self(self, pos):
+        if self._arity != 2:
+            Heap._sift_down_keyed(self._keys, self._items, pos, self._arity)
+        elif self._keys is self._items:
+            Heap._sift_down(self._items, pos)
+        else:
+            Heap._sift_down_binary_keyed(self._keys, self._items, pos)
 
 
-    def insert_list(self, xs):
+    def _heapify_self(self):
+        if self._arity == 2 and self._keys is self._items:
+            Heap._heapify(self._items)
+            return
+        for pos in reversed(range((len(self._items) - 2) // self._arity + 1)):
+            self._sift_down_self(pos)
+
+
+    @staticmethod
+    def _sift_up(items, pos):
         '''
-        Given a list xs, insert each element of xs into self.
+        Moves items[pos] up until its parent is no larger than it.
+        Rather than swapping at every step,
+        the larger parents are shifted down into the hole
+        and the value is written once at its final position.
         '''
-        for x in xs:
-            self.insert(x)
+        value = items[pos]
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if not value < items[parent]:
+                break
+            items[pos] = items[parent]
+            pos = parent
+        items[pos] = value
 
 
-    def find_smallest(self):
+    @staticmethod
+    def _sift_down(items, pos):
         '''
-        Returns the smallest value in the tree.
+        Moves items[pos] down until both of its children are no smaller than it.
         '''
-        if self.root:
-            return Heap._find_smallest(self.root)
+        n = len(items)
+        value = items[pos]
+        child = 2 * pos + 1
+        while child < n:
+            if child + 1 < n and items[child + 1] < items[child]:
+                child += 1
+            if not items[child] < value:
+                break
+            items[pos] = items[child]
+            pos = child
+            child = 2 * pos + 1
+        items[pos] = value
 
 
     @staticmethod
-    def _find_smallest(node):
-        return node.value
+    def _heapify(items):
+        '''
+        Rearranges the list items into a heap in O(n) by sifting down every parent,
+        starting from the last one.
+        Most parents are near the bottom of the tree and only move a short distance,
+        which is why this is linear rather than O(n log n).
+        '''
+        for pos in reversed(range(len(items) // 2)):
+            Heap._sift_down(items, pos)
 
 
-    def remove_min(self):
+    @staticmethod
+    def _sift_up_keyed(keys, items, pos, arity):
         '''
-        Removes the minimum value from the Heap.
-        If the heap is empty, it does nothing.
+        Like _sift_up, but for a heap with the given arity whose values are ordered by the parallel list keys.
+        Every move is made in both lists.
+        keys may be the same list as items, in which case each move just happens twice.
         '''
-        if self.root is None:
-            pass
-        elif self.root and self.root.left is None:
-            self.root = None
-        elif self.root and self.root.left:
-            self.root.value = Heap._remove_last_element(self.root)
-            if not Heap._is_heap_satisfied(self.root):
-                Heap._swap(self.root)
+        key = keys[pos]
+        item = items[pos]
+        while pos > 0:
+            parent = (pos - 1) // arity
+            if not key < keys[parent]:
+                break
+            keys[pos] = keys[parent]
+            items[pos] = items[parent]
+            pos = parent
+        keys[pos] = key
+        items[pos] = item
 
 
     @staticmethod
-    def _remove_last_element(node):
-        binary = "{0:b}".format(node.descendents)
-        node.descendents -= 1
-        if len(binary) == 1:
-            node = None
-        if len(binary) == 2:
-            if binary[1] == '1':
-                tmp = node.right
-                node.right = None
-            elif binary[1] == '0':
-                tmp = node.left
-                node.left = None
-            return tmp.value
-        else:
-            if binary[1] == '0':
-                return Heap._remove_last_element(node.left)
-            elif binary[1] == '1':
-                return Heap._remove_last_element(node.right)
+    def _sift_down_binary_keyed(keys, items, pos):
+        '''
+        _sift_down_keyed for arity 2:
+        with only two children there is no need for the loop over the children,
+        which makes keyed (and reversed) binary heaps nearly as fast as plain ones.
+        '''
+        n = len(keys)
+        key = keys[pos]
+        item = items[pos]
+        child = 2 * pos + 1
+        while child < n:
+            if child + 1 < n and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            keys[pos] = keys[child]
+            items[pos] = items[child]
+            pos = child
+            child = 2 * pos + 1
+        keys[pos] = key
+        items[pos] = item
 
 
     @staticmethod
-    def _swap(node):
-        if node.left is None and node.right is None:
-            return node
-        elif node.right is None:
-            node.value, node.left.value = node.left.value, node.value
-            return node
-        else:
-            if node.left.value < node.right.value:
-                node.value, node.left.value = node.left.value, node.value
-                if not Heap._is_heap_satisfied(node):
-                    Heap._swap(node.left)
-            else:
-                node.value, node.right.value = node.right.value, node.value
-                if not Heap._is_heap_satisfied(node):
-                    Heap._swap(node.right)
+    def _sift_down_keyed(keys, items, pos, arity):
+        '''
+        Like _sift_down, but for a heap with the given arity whose values are ordered by the parallel list keys.
+        '''
+        n = len(keys)
+        key = keys[pos]
+        item = items[pos]
+        child = arity * pos + 1
+        while child < n:
+            best = child
+            for other in range(child + 1, min(child + arity, n)):
+                if keys[other] < keys[best]:
+                    best = other
+            if not keys[best] < key:
+                break
+            keys[pos] = keys[best]
+            items[pos] = items[best]
+            pos = best
+            child = arity * pos + 1
+        keys[pos] = key
+        items[pos] = item
 
 
 '''
@@ -187,21 +504,3 @@ print(heap.print_tree('inorder'))
 heap.remove_min()
 print(heap.print_tree('inorder'))
 '''
-'''
-    def _insert(value, node):
-        if node.left is None:
-            node.left = Node(value)
-        elif node.right is None:
-            node.right = Node(value)
-        else:
-            node1=node
-            size = Heap.size(node)
-            level = math.floor(math.log(size+1)/math.log(2)- 1)
-            offset = size - (2**(level+ 1)-1)
-            maxi = 2**level
-            if offset <= maxi/2:
-                node1 = node.left
-            else:
-                node1 = node.right
-            Heap._insert(value,node1)
-'''
@@ -0,0 +1,215 @@
+'''
+This file implements an indexed priority queue:
+a binary min-heap that can also find, reprioritize, and remove any item it holds.
+'''
+
+import itertools
+
+
+class IndexedHeap:
+    '''
+    An IndexedHeap holds handles (any hashable values, such as the nodes of a graph),
+    each with a priority, and find_smallest/remove_min return the handle with the smallest priority.
+
+    Like the Heap, the heap is stored as a list in level order (see Heap.py).
+    In addition, a dict maps every handle to its current index in the list,
+    and every sift keeps the dict up to date.
+    This is what makes it possible to find an arbitrary handle in O(1),
+    and then decrease_key, increase_key, update, and remove it in O(log n)
+    by sifting it up or down from where it is,
+    instead of leaving stale entries behind ("lazy deletion").
+
+    Each entry of the list is a tuple (priority, count, handle),
+    where count records the order in which the handles were inserted.
+    Handles with equal priorities therefore come out in insertion order,
+    and the handles themselves are never compared.
+    '''
+
+    def __init__(self, items=None):
+        '''
+        items can be either a dict or a list of (handle, priority) pairs.
+        The heap is built in O(n).
+        '''
+        self._items = []
+        self._positions = {}
+        self._counter = itertools.count()
+        if items:
+            if hasattr(items, 'items'):
+                items = items.items()
+            for handle, priority in items:
+                if handle in self._positions:
+                    raise ValueError('handle is already in the heap: '+repr(handle))
+                self._positions[handle] = len(self._items)
+                self._items.append((priority, next(self._counter), handle))
+            for pos in reversed(range(len(self._items) // 2)):
+                self._sift_down(pos)
+
+    def __repr__(self):
+        pairs = [(handle, priority) for priority, _, handle in sorted(self._items)]
+        return type(self).__name__+'('+str(pairs)+')'
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, handle):
+        return handle in self._positions
+
+    def __getitem__(self, handle):
+        '''
+        Returns the priority of handle.
+        Raises a KeyError if handle is not in the heap.
+        '''
+        return self._items[self._positions[handle]][0]
+
+
+    def is_heap_satisfied(self):
+        '''
+        Checks the heap property and that the dict of positions agrees with the list.
+        '''
+        items = self._items
+        if any(items[i] < items[(i - 1) // 2] for i in range(1, len(items))):
+            return False
+        return len(self._positions) == len(items) and all(
+            items[pos][2] == handle for handle, pos in self._positions.items())
+
+
+    def insert(self, handle, priority):
+        '''
+        Inserts handle with the given priority.
+        Raises a ValueError if handle is already in the heap (use update to change its priority).
+        '''
+        if handle in self._positions:
+            raise ValueError('handle is already in the heap: '+repr(handle))
+        self._positions[handle] = len(self._items)
+        self._items.append((priority, next(self._counter), handle))
+        self._sift_up(len(self._items) - 1)
+
+
+    def find_smallest(self):
+        '''
+        Returns the pair (handle, priority) with the smallest priority,
+        or None if the heap is empty.
+        '''
+        if self._items:
+            priority, _, handle = self._items[0]
+            return handle, priority
+
+
+    def remove_min(self):
+        '''
+        Removes the handle with the smallest priority and returns the pair (handle, priority),
+        or returns None if the heap is empty.
+        '''
+        if not self._items:
+            return None
+        priority, _, handle = self._items[0]
+        self._remove_at(0)
+        return handle, priority
+
+
+    def remove(self, handle):
+        '''
+        Removes handle from the heap and returns its priority.
+        Raises a KeyError if handle is not in the heap.
+        '''
+        pos = self._positions[handle]
+        priority = self._items[pos][0]
+        self._remove_at(pos)
+        return priority
+
+
+    def decrease_key(self, handle, priority):
+        '''
+        Lowers the priority of handle to priority.
+        Raises a KeyError if handle is not in the heap,
+        and a ValueError if priority is larger than its current priority.
+        '''
+        pos = self._positions[handle]
+        if self._items[pos][0] < priority:
+            raise ValueError('decrease_key cannot increase the priority')
+        self._items[pos] = (priority,) + self._items[pos][1:]
+        self._sift_up(pos)
+
+
+    def increase_key(self, handle, priority):
+        '''
+        Raises the priority of handle to priority.
+        Raises a KeyError if handle is not in the heap,
+        and a ValueError if priority is smaller than its current priority.
+        '''
+        pos = self._positions[handle]
+        if priority < self._items[pos][0]:
+            raise ValueError('increase_key cannot decrease the priority')
+        self._items[pos] = (priority,) + self._items[pos][1:]
+        self._sift_down(pos)
+
+
+    def update(self, handle, priority):
+        '''
+        Sets the priority of handle to priority, in either direction.
+        If handle is not in the heap, it is inserted.
+        Changing a priority keeps the handle's original place in the insertion order for breaking ties.
+        '''
+        if handle not in self._positions:
+            self.insert(handle, priority)
+            return
+        pos = self._positions[handle]
+        self._items[pos] = (priority,) + self._items[pos][1:]
+        self._sift_up(pos)
+        self._sift_down(self._positions[handle])
+
+
+    def _remove_at(self, pos):
+        '''
+        Removes the entry at index pos:
+        the last entry takes its place and is then sifted up or down, whichever is needed.
+        '''
+        items = self._items
+        del self._positions[items[pos][2]]
+        last = items.pop()
+        if pos == len(items):
+            return
+        items[pos] = last
+        self._positions[last[2]] = pos
+        self._sift_up(pos)
+        self._sift_down(self._positions[last[2]])
+
+
+    def _sift_up(self, pos):
+        '''
+        Like Heap._sift_up, but also records the new index of every entry it moves.
+        '''
+        items = self._items
+        positions = self._positions
+        entry = items[pos]
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if not entry < items[parent]:
+                break
+            items[pos] = items[parent]
+            positions[items[pos][2]] = pos
+            pos = parent
+        items[pos] = entry
+        positions[entry[2]] = pos
+
+
+    def _sift_down(self, pos):
+        '''
+        Like Heap._sift_down, but also records the new index of every entry it moves.
+        '''
+        items = self._items
+        positions = self._positions
+        n = len(items)
+        entry = items[pos]
+        child = 2 * pos + 1
+        while child < n:
+            if child + 1 < n and items[child + 1] < items[child]:
+                child += 1
+            if not items[child] < entry:
+                break
+            items[pos] = items[child]
+            positions[items[pos][2]] = pos
+            pos = child
+            child = 2 * pos + 1
+        items[pos] = entry
+        positions[entry[2]] = pos
@@ -0,0 +1,150 @@
+'''
+This file implements the leftist heap, a min-heap that can be merged with another heap in O(log n).
+'''
+
+from Trees.BinaryTree import BinaryTree, Node
+from Trees.Heap import Heap
+
+
+class LeftistNode(Node):
+    '''
+    A Node that also remembers its rank:
+    the number of nodes on the path from it down its right spine (so a leaf has rank 1, and None has rank 0).
+    '''
+    __slots__ = ('rank',)
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.rank = 1
+
+
+class LeftistHeap(BinaryTree):
+    '''
+    A binary min-heap that supports meld: merging two heaps into one in O(log n).
+
+    The array-based Heap cannot do this faster than inserting every value of one heap into the other.
+    A leftist heap is instead a tree of nodes where, in addition to the heap property,
+    the rank of every left child is at least the rank of its right sibling.
+    This makes the right spine of every subtree short:
+    a subtree with rank r has at least 2^r - 1 nodes, so the right spine has at most log(n+1) nodes.
+
+    Two leftist heaps are melded by merging their right spines like two sorted lists,
+    and swapping the children of any node on the merged spine that breaks the rank rule.
+    Only the O(log n) nodes on the spines are touched.
+    Every other operation is built on meld:
+    insert melds the heap with a single node,
+    and remove_min melds the two subtrees of the root.
+    '''
+
+    def __init__(self, xs=None):
+        super().__init__()
+        if xs:
+            self.insert_list(xs)
+
+    def __repr__(self):
+        return type(self).__name__+'('+str(self.to_list('levelorder'))+')'
+
+
+    @staticmethod
+    def _rank(node):
+        '''
+        Returns the cached rank of a LeftistNode,
+        or walks the right spine for a plain Node (such as in a heap built by hand in the test cases).
+        '''
+        if isinstance(node, LeftistNode):
+            return node.rank
+        rank = 0
+        while node is not None:
+            rank += 1
+            node = node.right
+        return rank
+
+
+    @staticmethod
+    def _update(node):
+        if isinstance(node, LeftistNode):
+            node.rank = LeftistHeap._rank(node.right) + 1
+
+
+    def is_heap_satisfied(self):
+        '''
+        Checks both the heap property and the rank rule (and the cached ranks).
+        '''
+        if not Heap._is_heap_satisfied(self.root):
+            return False
+        for node in BinaryTree._postorder_nodes(self.root):
+            if LeftistHeap._rank(node.left) < LeftistHeap._rank(node.right):
+                return False
+            if isinstance(node, LeftistNode) and node.rank != LeftistHeap._rank(node.right) + 1:
+                return False
+        return True
+
+
+    def meld(self, other):
+        '''
+        Moves every value of the LeftistHeap other into self in O(log n).
+        The nodes of other are reused, so other is left empty.
+        A heap cannot be melded with itself (its nodes would end up linked to themselves).
+        '''
+        if other is self:
+            raise ValueError('cannot meld a heap with itself')
+        self.root = LeftistHeap._meld(self.root, other.root)
+        other.root = None
+
+
+    @staticmethod
+    def _meld(a, b):
+        '''
+        Merges the heaps rooted at a and b and returns the root of the result.
+        The recursion only follows right children, so it is O(log n) deep.
+        '''
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.value < a.value:
+            a, b = b, a
+        a.right = LeftistHeap._meld(a.right, b)
+        if LeftistHeap._rank(a.left) < LeftistHeap._rank(a.right):
+            a.left, a.right = a.right, a.left
+        LeftistHeap._update(a)
+        return a
+
+
+    def insert(self, value):
+        self.root = LeftistHeap._meld(self.root, LeftistNode(value))
+
+
+    def insert_list(self, xs):
+        '''
+        Given a list xs, insert each element of xs into self.
+        Rather than n separate inserts (O(n log n)),
+        the values are made into one-node heaps that are melded in pairs, then the results in pairs, and so on.
+        Like building the array-based Heap bottom up, this takes O(n) in total.
+        '''
+        heaps = [LeftistNode(x) for x in xs]
+        while len(heaps) > 1:
+            heaps = [LeftistHeap._meld(heaps[i], heaps[i + 1]) if i + 1 < len(heaps) else heaps[i]
+                     for i in range(0, len(heaps), 2)]
+        if heaps:
+            self.root = LeftistHeap._meld(self.root, heaps[0])
+
+
+    def find_smallest(self):
+        '''
+        Returns the smallest value in the tree.
+        '''
+        if self.root:
+            return self.root.value
+
+
+    def remove_min(self):
+        '''
+        Removes the minimum value from the heap and returns it.
+        If the heap is empty, it does nothing.
+        '''
+        if self.root is None:
+            return None
+        value = self.root.value
+        self.root = LeftistHeap._meld(self.root.left, self.root.right)
+        return value
@@ -0,0 +1,133 @@
+'''
+This file implements a read-only tree that answers queries straight from a file written by BST.dump.
+'''
+
+import array
+import bisect
+import mmap
+import pickle
+import sys
+
+from Trees.BinaryFormat import read_header, HEADER, SORTED, PICKLE
+
+
+class MappedTree:
+    '''
+    A read-only view of a file written by BST.dump (or AVLTree.dump, TreeMap.dump, ...).
+
+    The file is memory mapped and its sorted values are searched with binary search,
+    so opening a MappedTree is O(1) no matter how large the file is:
+    no Node objects are built, and the operating system only reads the pages of the file that a query touches.
+    find, floor, ceiling, select, rank, and count_range are O(log n),
+    and irange is O(log n + k) for k results.
+
+    This only works without copying when the values are int64s or float64s stored in native byte order;
+    otherwise (pickled values, or a big endian machine) the values are loaded into a plain list first.
+
+    A MappedTree should be closed when it is no longer needed,
+    either by calling close or by using it in a with statement.
+    '''
+
+    def __init__(self, path):
+        with open(path, 'rb') as fp:
+            header = fp.read(HEADER.size)
+            order, typecode, count = read_header(header)
+            if order != SORTED:
+                raise ValueError('MappedTree requires a file of sorted values')
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+        self._view = None
+        if count == 0:
+            self._values = []
+        elif typecode == PICKLE:
+            self._values = pickle.loads(self._mmap[HEADER.size:])
+        elif sys.byteorder == 'big':
+            self._values = array.array(typecode.decode(), self._mmap[HEADER.size:HEADER.size + 8 * count])
+            self._values.byteswap()
+        else:
+            self._view = memoryview(self._mmap)[HEADER.size:HEADER.size + 8 * count].cast(typecode.decode())
+            self._values = self._view
+
+    def __repr__(self):
+        return type(self).__name__+'('+str(len(self))+' values)'
+
+    def close(self):
+        self._values = []
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __contains__(self, value):
+        return self.find(value)
+
+    def find(self, value):
+        i = bisect.bisect_left(self._values, value)
+        return i < len(self._values) and self._values[i] == value
+
+    def find_smallest(self):
+        if len(self._values):
+            return self._values[0]
+
+    def find_largest(self):
+        if len(self._values):
+            return self._values[-1]
+
+    def select(self, k):
+        '''
+        Returns the k-th smallest value (counting from 0), like BST.select.
+        '''
+        n = len(self._values)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError('select index out of range')
+        return self._values[k]
+
+    def rank(self, value):
+        '''
+        Returns the number of values smaller than value, like BST.rank.
+        '''
+        return bisect.bisect_left(self._values, value)
+
+    def floor(self, value):
+        i = bisect.bisect_right(self._values, value)
+        return self._values[i - 1] if i else None
+
+    def ceiling(self, value):
+        i = bisect.bisect_left(self._values, value)
+        return self._values[i] if i < len(self._values) else None
+
+    def _bounds(self, lo, hi, inclusive):
+        '''
+        Returns the indices (start, stop) of the values between lo and hi, with the same meaning as in BST.irange.
+        '''
+        start, stop = 0, len(self._values)
+        if lo is not None:
+            start = (bisect.bisect_left if inclusive[0] else bisect.bisect_right)(self._values, lo)
+        if hi is not None:
+            stop = (bisect.bisect_right if inclusive[1] else bisect.bisect_left)(self._values, hi)
+        return start, max(start, stop)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        start, stop = self._bounds(lo, hi, inclusive)
+        indices = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        for i in indices:
+            yield self._values[i]
+
+    def count_range(self, lo=None, hi=None, inclusive=(True, True)):
+        start, stop = self._bounds(lo, hi, inclusive)
+        return stop - start
@@ -0,0 +1,107 @@
+'''
+This file implements a lazy k-way merge of sorted iterables and an external sort built on it,
+both on top of the Heap.
+'''
+
+import itertools
+import pickle
+import tempfile
+
+from Trees.Heap import Heap
+
+
+def merge(*iterables, key=None):
+    '''
+    Merges any number of sorted iterables into a single sorted stream, lazily.
+
+    The Heap holds one entry (key, i, value) for the next value of every iterable i that is not exhausted yet,
+    so each value costs O(log k) for k iterables and only k values are held in memory at once.
+    Equal keys come out in the order of the iterables they came from,
+    and since i is unique the values themselves are never compared.
+    Like sorted, key is an optional function that is called once per value.
+    '''
+    iterators = [iter(iterable) for iterable in iterables]
+    entries = []
+    for i, iterator in enumerate(iterators):
+        for value in iterator:
+            entries.append((value if key is None else key(value), i, value))
+            break
+    heap = Heap(entries)
+    while len(heap):
+        _, i, value = heap.find_smallest()
+        yield value
+        for value in iterators[i]:
+            heap.replace((value if key is None else key(value), i, value))
+            break
+        else:
+            heap.remove_min()
+
+
+_BLOCK_SIZE = 1024
+
+
+def external_sort(iterable, run_size=10**6, tmpdir=None, key=None):
+    '''
+    Sorts iterable, which may be too large to fit in memory, and returns an iterator over its values in sorted order.
+
+    The values are read run_size at a time;
+    each run is sorted in memory and appended to a single temporary file in tmpdir (the system default if None),
+    and the sorted runs are then merged back as a stream with merge.
+    Each run remembers where in the file it starts and ends, and is read back from there,
+    so only one file is ever open no matter how many runs there are.
+    At most run_size values are in memory while the runs are written,
+    and only one block of values per run while they are merged.
+    The file is written and read through a buffered file object,
+    in pickled blocks of _BLOCK_SIZE values so that the per-value overhead of pickle stays small.
+    The sort is stable, and the temporary file is deleted once the result has been consumed (or closed).
+    If the whole input fits in a single run, nothing is written to disk.
+
+    The arguments are checked right away, when external_sort is called;
+    the sorting itself only starts once the first value is requested (see _external_sort).
+    '''
+    if run_size < 1:
+        raise ValueError('run_size must be positive')
+    return _external_sort(iterable, run_size, tmpdir, key)
+
+
+def _external_sort(iterable, run_size, tmpdir, key):
+    '''
+    The generator behind external_sort.
+    Its body does not run until the first next(),
+    which is why the arguments are validated in external_sort instead of here.
+    '''
+    iterator = iter(iterable)
+    run = list(itertools.islice(iterator, run_size))
+    following = list(itertools.islice(iterator, 1))
+    if not following:
+        run.sort(key=key)
+        yield from run
+        return
+    iterator = itertools.chain(following, iterator)
+
+    fp = tempfile.TemporaryFile(dir=tmpdir)
+    try:
+        runs = []
+        while run:
+            run.sort(key=key)
+            start = fp.tell()
+            for i in range(0, len(run), _BLOCK_SIZE):
+                pickle.dump(run[i:i + _BLOCK_SIZE], fp, protocol=pickle.HIGHEST_PROTOCOL)
+            runs.append((start, fp.tell()))
+            run = list(itertools.islice(iterator, run_size))
+        fp.flush()
+        yield from merge(*[_read_run(fp, start, end) for start, end in runs], key=key)
+    finally:
+        fp.close()
+
+
+def _read_run(fp, start, end):
+    '''
+    Yields the values of the run stored in fp between the offsets start and end, one block at a time.
+    The runs share fp, so every block is read after seeking to where this run left off.
+    '''
+    while start < end:
+        fp.seek(start)
+        block = pickle.load(fp)
+        start = fp.tell()
+        yield from block
@@ -0,0 +1,104 @@
+'''
+This file implements a persistent (immutable) version of the AVLTree.
+'''
+
+from Trees.AVLTree import AVLTree
+
+
+class PersistentAVLTree(AVLTree):
+    '''
+    A PersistentAVLTree is never modified after it is created.
+    Instead, insert and remove return a new version of the tree,
+    and the old version stays valid (and unchanged) forever.
+
+    Copying the whole tree for every version would cost O(n) per update.
+    Instead, only the O(log n) nodes on the path from the root to the changed node are copied (path copying),
+    and the new version shares every other node with the old one.
+    This is the same copy-on-write mechanism that AVLTree.snapshot uses,
+    so the functions below just take an O(1) snapshot and modify that.
+
+    All of the functions that only read the tree (find, select, irange, to_list, ...) work exactly as in the AVLTree.
+    '''
+
+    def __init__(self, xs=None):
+        super().__init__()
+        if xs:
+            self.root = AVLTree(xs).root
+
+    @staticmethod
+    def _view(tree):
+        '''
+        Returns a mutable AVLTree that shares its nodes with tree in copy-on-write mode,
+        so that modifying it never modifies tree.
+        '''
+        view = AVLTree()
+        view.root = tree.root
+        view._owner = object()
+        return view
+
+
+    def _derive(self, method, *args):
+        '''
+        Applies the AVLTree function method to a view of self
+        and returns the result as a new version.
+        '''
+        view = PersistentAVLTree._view(self)
+        method(view, *args)
+        return self._wrap(view.root)
+
+
+    def insert(self, value):
+        '''
+        Returns a new version of the tree that also holds value.
+        '''
+        return self._derive(AVLTree.insert, value)
+
+
+    def remove(self, value):
+        '''
+        Returns a new version of the tree without value.
+        '''
+        return self._derive(AVLTree.remove, value)
+
+
+    def insert_list(self, xs):
+        '''
+        Returns a new version of the tree that also holds every element of xs.
+        '''
+        return self._derive(AVLTree.insert_list, xs)
+
+
+    def remove_list(self, xs):
+        '''
+        Returns a new version of the tree without any element of xs.
+        '''
+        return self._derive(AVLTree.remove_list, xs)
+
+
+    def remove_range(self, lo=None, hi=None, inclusive=(True, True)):
+        '''
+        Returns a new version of the tree without the values between lo and hi.
+        Unlike insert and remove this is O(n) (see AVLTree.snapshot).
+        '''
+        return self._derive(AVLTree.remove_range, lo, hi, inclusive)
+
+
+    def split(self, key):
+        '''
+        Returns two new trees (lt, ge) holding the values of self smaller than key and the rest.
+        Unlike insert and remove this is O(n) (see AVLTree.snapshot).
+        '''
+        lt, ge = AVLTree.split(PersistentAVLTree._view(self), key)
+        return self._wrap(lt.root), self._wrap(ge.root)
+
+
+    @classmethod
+    def join(cls, left, right):
+        '''
+        Returns a new tree holding the values of left and right,
+        where every value of left must be smaller than every value of right.
+        Unlike insert and remove this is O(n) (see AVLTree.snapshot).
+        '''
+        tree = cls()
+        tree.root = AVLTree.join(PersistentAVLTree._view(left), PersistentAVLTree._view(right)).root
+        return tree
@@ -0,0 +1,123 @@
+'''
+This file implements a bounded collector that keeps the k best values of a stream, on top of the Heap.
+'''
+
+import itertools
+
+from Trees.Heap import Heap
+
+
+class TopK:
+    '''
+    Keeps the k largest values pushed into it (or the k smallest, if largest=False),
+    using O(k) memory no matter how many values are pushed.
+
+    The values are kept in a Heap ordered so that the worst of the kept values is at the root:
+    to keep the k largest values, the heap is a min-heap.
+    A new value only needs to be compared with the root;
+    if it is better, it replaces the root with a single O(log k) sift down (Heap.pushpop).
+    Pushing n values therefore costs O(n log k) time in the worst case,
+    and close to O(n) when most values are not good enough to be kept.
+
+    Like sorted, TopK takes an optional key function, which is computed once per value.
+    Every value is stored in the heap as a tuple (key, order, value),
+    where order counts the values pushed so far (negated when keeping the largest values).
+    So among values with equal keys, the ones pushed first are the ones kept,
+    and they come first in result(), just like heapq.nlargest and sorted(...)[:k];
+    the values themselves are never compared.
+    '''
+
+    def __init__(self, k, key=None, largest=True):
+        if k < 0:
+            raise ValueError('k must not be negative')
+        self.k = k
+        self._key = key
+        self._largest = largest
+        self._counter = itertools.count()
+        self._heap = Heap(reverse=not largest)
+
+    def __repr__(self):
+        return type(self).__name__+'('+str(self.k)+', largest='+str(self._largest)+')'
+
+    def __len__(self):
+        return len(self._heap)
+
+
+    def _entry(self, value):
+        order = next(self._counter)
+        key = value if self._key is None else self._key(value)
+        return (key, -order if self._largest else order, value)
+
+
+    def push(self, value):
+        '''
+        Offers value to the collector; it is kept if it is among the k best values seen so far.
+        '''
+        self.pushpop(value)
+
+
+    def pushpop(self, value):
+        '''
+        Offers value to the collector and returns the value that is no longer kept:
+        either value itself, or the kept value it pushed out.
+        Returns None while fewer than k values have been pushed.
+        '''
+        if len(self._heap) < self.k:
+            self._heap.insert(self._entry(value))
+            return None
+        return self._heap.pushpop(self._entry(value))[2]
+
+
+    def replace(self, value):
+        '''
+        Removes and returns the worst kept value and keeps value instead,
+        even if value is worse than the value it replaces.
+        '''
+        if self.k == 0:
+            return value
+        if len(self._heap) < self.k:
+            self._heap.insert(self._entry(value))
+            return None
+        return self._heap.replace(self._entry(value))[2]
+
+
+    def extend(self, values):
+        '''
+        Offers every value of the iterable values to the collector.
+        '''
+        heap = self._heap
+        entry = self._entry
+        values = iter(values)
+        missing = self.k - len(heap)
+        if missing > 0:
+            heap.insert_list(entry(value) for value in itertools.islice(values, missing))
+        pushpop = heap.pushpop
+        for value in values:
+            pushpop(entry(value))
+
+
+    def result(self):
+        '''
+        Returns the kept values as a list, best first.
+        '''
+        return [value for _, _, value in sorted(self._heap._items, reverse=self._largest)]
+
+
+def nsmallest(k, iterable, key=None):
+    '''
+    Returns a list of the k smallest values of iterable, smallest first,
+    in O(n log k) time and O(k) memory.
+    '''
+    top = TopK(k, key=key, largest=False)
+    top.extend(iterable)
+    return top.result()
+
+
+def nlargest(k, iterable, key=None):
+    '''
+    Returns a list of the k largest values of iterable, largest first,
+    in O(n log k) time and O(k) memory.
+    '''
+    top = TopK(k, key=key, largest=True)
+    top.extend(iterable)
+    return top.result()
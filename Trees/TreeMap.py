@@ -0,0 +1,165 @@
+'''
+This file implements an ordered map (like a dict whose keys are kept in sorted order) on top of the AVLTree.
+'''
+
+import pickle
+
+from Trees.BinaryTree import BinaryTree
+from Trees.BST import BST
+from Trees.AVLTree import AVLTree, AVLNode
+
+
+class TreeMapNode(AVLNode):
+    '''
+    An AVLNode that also stores the payload associated with its value.
+    The value of the node is the key of the map.
+    Keeping the payload in the node itself means a single O(log n) descent
+    finds both the key and its payload,
+    so there is no need for a separate dict next to the tree.
+    '''
+    __slots__ = ('payload',)
+
+    def __init__(self, value, payload=None):
+        super().__init__(value)
+        self.payload = payload
+
+
+class TreeMap(AVLTree):
+    '''
+    A TreeMap maps keys to payloads like a dict,
+    but it keeps its keys in sorted order.
+    All of the AVLTree functions (select, rank, irange, floor, ceiling, ...) work on the keys,
+    and iterating over a TreeMap yields its keys in sorted order, just like iterating over a dict yields its keys.
+    '''
+
+    def __init__(self, items=None):
+        '''
+        items can be either a dict or a list of (key, payload) pairs.
+        '''
+        super().__init__()
+        if items:
+            self.update(items)
+
+    def __repr__(self):
+        return type(self).__name__+'('+str(list(self.items()))+')'
+
+
+    @staticmethod
+    def _make_node(value):
+        return TreeMapNode(value)
+
+
+    @staticmethod
+    def _copy_node(node):
+        return TreeMapNode(node.value, getattr(node, 'payload', None))
+
+
+    def dump(self, fp):
+        '''
+        Writes the keys like AVLTree.dump does, followed by the pickled list of payloads in key order.
+        '''
+        super().dump(fp)
+        pickle.dump(list(self.values()), fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+    @classmethod
+    def load(cls, fp):
+        tree = super().load(fp)
+        payloads = pickle.load(fp)
+        for node, payload in zip(BinaryTree._inorder_nodes(tree.root), payloads):
+            node.payload = payload
+        return tree
+
+
+    def __getitem__(self, key):
+        '''
+        Returns the payload stored under key.
+        Like a dict, it raises a KeyError if key is not in the map.
+        '''
+        node = BST._find_node(key, self.root)
+        if node is None:
+            raise KeyError(key)
+        return node.payload
+
+
+    def __setitem__(self, key, payload):
+        '''
+        Stores payload under key, replacing any payload already there.
+        After a snapshot the nodes may be shared,
+        so instead of changing the payload in place the path down to key is copied.
+        '''
+        if self._owner is not None:
+            self.root = AVLTree._insert_copy(TreeMapNode(key, payload), self.root, self._owner, True)
+            return
+        node = BST._find_node(key, self.root)
+        if node is None:
+            self.root = AVLTree._insert_node(TreeMapNode(key, payload), self.root)
+        else:
+            node.payload = payload
+
+
+    def __delitem__(self, key):
+        '''
+        Removes key (and its payload) from the map.
+        Like a dict, it raises a KeyError if key is not in the map.
+        '''
+        if BST._find_node(key, self.root) is None:
+            raise KeyError(key)
+        self.remove(key)
+
+
+    def get(self, key, default=None):
+        '''
+        Returns the payload stored under key, or default if key is not in the map.
+        '''
+        node = BST._find_node(key, self.root)
+        if node is None:
+            return default
+        return node.payload
+
+
+    def setdefault(self, key, default=None):
+        '''
+        Returns the payload stored under key.
+        If key is not in the map, then default is first stored under key.
+        '''
+        node = BST._find_node(key, self.root)
+        if node is None:
+            self[key] = default
+            return default
+        return node.payload
+
+
+    def update(self, items):
+        '''
+        Stores every (key, payload) pair of items in the map.
+        items can be either a dict or a list of pairs.
+        '''
+        if hasattr(items, 'items'):
+            items = items.items()
+        for key, payload in items:
+            self[key] = payload
+
+
+    def keys(self):
+        '''
+        Yields the keys in sorted order.
+        '''
+        for node in BinaryTree._inorder_nodes(self.root):
+            yield node.value
+
+
+    def values(self):
+        '''
+        Yields the payloads in the sorted order of their keys.
+        '''
+        for node in BinaryTree._inorder_nodes(self.root):
+            yield node.payload
+
+
+    def items(self):
+        '''
+        Yields (key, payload) pairs in sorted order of the keys.
+        '''
+        for node in BinaryTree._inorder_nodes(self.root):
+            yield node.value, node.payload
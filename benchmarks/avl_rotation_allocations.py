@@ -0,0 +1,136 @@
+'''
+Counts how many nodes the AVLTree allocates while inserting keys,
+comparing the old rotations (which built brand-new nodes on every rotation)
+against the in-place rotations that simply relink the existing nodes.
+
+Run from the root of the repository:
+
+    python -m benchmarks.avl_rotation_allocations [n]
+'''
+
+import random
+import sys
+import time
+import tracemalloc
+
+import Trees.AVLTree
+from Trees.AVLTree import AVLTree
+
+
+class CountingAVLNode(Trees.AVLTree.AVLNode):
+    '''
+    An AVLNode that counts how many times it has been constructed.
+    '''
+    __slots__ = ()
+    allocations = 0
+
+    def __init__(self, value):
+        super().__init__(value)
+        CountingAVLNode.allocations += 1
+
+
+class CopyingAVLTree(AVLTree):
+    '''
+    The AVLTree with the rotations it used to have,
+    which allocate two new nodes per rotation.
+    '''
+
+    @staticmethod
+    def _left_rotate(node):
+        if node is None or node.right is None:
+            return node
+        AVLNode = Trees.AVLTree.AVLNode
+        new_root = AVLNode(node.right.value)
+        new_root.right = node.right.right
+        new_root.left = AVLNode(node.value)
+        new_root.left.left = node.left
+        new_root.left.right = node.right.left
+        AVLTree._update(new_root.left)
+        AVLTree._update(new_root)
+        return new_root
+
+    @staticmethod
+    def _right_rotate(node):
+        if node is None or node.left is None:
+            return node
+        AVLNode = Trees.AVLTree.AVLNode
+        new_root = AVLNode(node.left.value)
+        new_root.left = node.left.left
+        new_root.right = AVLNode(node.value)
+        new_root.right.left = node.left.right
+        new_root.right.right = node.right
+        AVLTree._update(new_root.right)
+        AVLTree._update(new_root)
+        return new_root
+
+    @staticmethod
+    def rebalance(node):
+        if CopyingAVLTree._balance_factor(node) < -1:
+            if CopyingAVLTree._balance_factor(node.right) > 0:
+                node.right = CopyingAVLTree._right_rotate(node.right)
+            return CopyingAVLTree._left_rotate(node)
+        elif CopyingAVLTree._balance_factor(node) > 1:
+            if CopyingAVLTree._balance_factor(node.left) < 0:
+                node.left = CopyingAVLTree._left_rotate(node.left)
+            return CopyingAVLTree._right_rotate(node)
+        else:
+            return node
+
+    @staticmethod
+    def _insert(value, node):
+        AVLNode = Trees.AVLTree.AVLNode
+        if value < node.value:
+            if node.left is None:
+                node.left = AVLNode(value)
+            else:
+                node.left = CopyingAVLTree._insert(value, node.left)
+        elif value > node.value:
+            if node.right is None:
+                node.right = AVLNode(value)
+            else:
+                node.right = CopyingAVLTree._insert(value, node.right)
+        AVLTree._update(node)
+        return CopyingAVLTree.rebalance(node)
+
+    def insert(self, value):
+        if self.root is None:
+            self.root = Trees.AVLTree.AVLNode(value)
+        else:
+            self.root = CopyingAVLTree._insert(value, self.root)
+
+
+def measure(cls, xs):
+    '''
+    Returns the number of node allocations, the total bytes allocated and the wall time
+    needed to insert every element of xs into an empty tree of type cls.
+    '''
+    original = Trees.AVLTree.AVLNode
+    Trees.AVLTree.AVLNode = CountingAVLNode
+    CountingAVLNode.allocations = 0
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        tree = cls()
+        tree.insert_list(xs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        Trees.AVLTree.AVLNode = original
+    assert tree.is_avl_satisfied()
+    return CountingAVLNode.allocations, peak, elapsed
+
+
+def main(n=10**5):
+    random.seed(0)
+    xs = list(range(n))
+    random.shuffle(xs)
+    print('inserting %d shuffled keys' % n)
+    for name, cls in [('copying rotations', CopyingAVLTree), ('in-place rotations', AVLTree)]:
+        allocations, peak, elapsed = measure(cls, xs)
+        print('%-20s %9d node allocations  %6.2f per insert  peak %6.1f MiB  %6.2fs (traced)'
+              % (name, allocations, allocations / n, peak / 2**20, elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,58 @@
+'''
+Compares the cost of a point-in-time copy of an AVLTree:
+copy.deepcopy (O(n) time and memory per copy) against AVLTree.snapshot (O(1)),
+and measures how much slower insert becomes while a snapshot shares the tree's nodes.
+
+Run from the root of the repository:
+
+    python -m benchmarks.avl_snapshot [n]
+'''
+
+import copy
+import random
+import sys
+import time
+import tracemalloc
+
+from Trees.AVLTree import AVLTree
+
+
+def timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def allocated(f):
+    tracemalloc.start()
+    result = f()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main(n=10**5):
+    random.seed(0)
+    xs = random.sample(range(10 * n), n)
+    avl = AVLTree(xs)
+    print('n=%d' % n)
+
+    seconds = timed(lambda: copy.deepcopy(avl.root))
+    size, _ = allocated(lambda: copy.deepcopy(avl.root))
+    print('deepcopy        %8.4fs %10d bytes' % (seconds, size))
+    seconds = timed(lambda: avl.snapshot())
+    size, _ = allocated(lambda: avl.snapshot())
+    print('snapshot        %8.4fs %10d bytes' % (seconds, size))
+
+    ys = random.sample(range(10 * n, 20 * n), n)
+    plain = AVLTree(xs)
+    seconds = timed(lambda: [plain.insert(y) for y in ys])
+    print('insert          %8.0f ops/s' % (n / seconds))
+    shared = AVLTree(xs)
+    shared.snapshot()
+    seconds = timed(lambda: [shared.insert(y) for y in ys])
+    print('insert (shared) %8.0f ops/s' % (n / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,90 @@
+'''
+Measures the throughput of a ConcurrentTree(AVLTree) shared by several threads.
+Each thread runs a mix of finds and irange reads,
+and one extra thread inserts and removes a batch of values every 10ms.
+The same workload is also run behind a plain threading.Lock for comparison.
+
+On a regular CPython build the GIL lets only one thread run Python code at a time,
+so the readers-writer lock mostly buys fairness rather than speed;
+on a free-threaded build (python3.13t and later) the readers run in parallel.
+
+Run from the root of the repository:
+
+    python -m benchmarks.concurrent_throughput [n] [seconds]
+'''
+
+import random
+import sys
+import threading
+import time
+
+from Trees.AVLTree import AVLTree
+from Trees.ConcurrentTree import ConcurrentTree
+
+
+class LockedTree:
+    '''
+    The baseline: every call holds one ordinary lock.
+    '''
+
+    def __init__(self, tree):
+        self._tree = tree
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        function = getattr(self._tree, name)
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                result = function(*args, **kwargs)
+                return list(result) if name == 'irange' else result
+        return locked
+
+
+def run(tree, n, threads, seconds):
+    stop = threading.Event()
+    counts = [0] * threads
+    batches = [0]
+
+    def reader(i):
+        rng = random.Random(i)
+        count = 0
+        while not stop.is_set():
+            x = rng.randrange(n)
+            tree.find(x)
+            tree.irange(x, x + 10)
+            count += 2
+        counts[i] = count
+
+    def writer():
+        rng = random.Random(-1)
+        while not stop.is_set():
+            batch = rng.sample(range(n, 2 * n), 100)
+            tree.insert_list(batch)
+            tree.remove_list(batch)
+            batches[0] += 1
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=writer))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / seconds, batches[0] / seconds
+
+
+def main(n=10**5, seconds=2):
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('n=%d gil=%s' % (n, gil))
+    xs = list(range(n))
+    for threads in [1, 2, 4, 8]:
+        for name, wrapper in [('ConcurrentTree', ConcurrentTree), ('Lock', LockedTree)]:
+            reads, batches = run(wrapper(AVLTree(xs)), n, threads, seconds)
+            print('threads=%d  %-14s %9.0f reads/s %6.0f write batches/s' % (threads, name, reads, batches))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
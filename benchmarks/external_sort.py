@@ -0,0 +1,37 @@
+'''
+Times external_sort on n random floats with runs of a given size,
+against sorted() on the whole list in memory,
+and times merge against the standard library's heapq.merge on the same sorted runs.
+
+Run from the root of the repository:
+
+    python -m benchmarks.external_sort [n] [run_size]
+'''
+
+import heapq
+import random
+import sys
+import time
+
+from Trees.Merge import merge, external_sort
+
+
+def timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def main(n=10**6, run_size=10**5):
+    random.seed(0)
+    xs = [random.random() for _ in range(n)]
+    print('n=%d run_size=%d' % (n, run_size))
+    print('sorted          %8.3fs' % timed(lambda: sorted(xs)))
+    print('external_sort   %8.3fs' % timed(lambda: sum(1 for _ in external_sort(xs, run_size))))
+    runs = [sorted(xs[i:i + run_size]) for i in range(0, n, run_size)]
+    print('merge           %8.3fs' % timed(lambda: sum(1 for _ in merge(*runs))))
+    print('heapq.merge     %8.3fs' % timed(lambda: sum(1 for _ in heapq.merge(*runs))))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,59 @@
+'''
+Measures the Heap at 10^6 elements:
+how long Heap(xs) takes to build (bottom-up heapify),
+and how many insert and remove_min operations per second it sustains.
+The standard library's heapq module is timed alongside as a reference point,
+and the binary heap is compared with 4-ary and 8-ary heaps and with a key function.
+
+Run from the root of the repository:
+
+    python -m benchmarks.heap_push_pop [n]
+'''
+
+import heapq
+import random
+import sys
+import time
+
+from Trees.Heap import Heap
+
+
+def timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def main(n=10**6):
+    random.seed(0)
+    xs = [random.random() for _ in range(n)]
+    print('n=%d' % n)
+
+    seconds = timed(lambda: Heap(xs))
+    print('Heap(xs)        %8.3fs' % seconds)
+    seconds = timed(lambda: heapq.heapify(list(xs)))
+    print('heapq.heapify   %8.3fs' % seconds)
+
+    heap = Heap()
+    seconds = timed(lambda: [heap.insert(x) for x in xs])
+    print('Heap.insert     %8.0f ops/s' % (n / seconds))
+    seconds = timed(lambda: [heap.remove_min() for _ in xs])
+    print('Heap.remove_min %8.0f ops/s' % (n / seconds))
+
+    for kwargs in [dict(arity=4), dict(arity=8), dict(key=abs)]:
+        name = ','.join('%s=%s' % (k, getattr(v, '__name__', v)) for k, v in kwargs.items())
+        heap = Heap(**kwargs)
+        seconds = timed(lambda: [heap.insert(x) for x in xs])
+        print('Heap(%s).insert     %8.0f ops/s' % (name, n / seconds))
+        seconds = timed(lambda: [heap.remove_min() for _ in xs])
+        print('Heap(%s).remove_min %8.0f ops/s' % (name, n / seconds))
+
+    items = []
+    seconds = timed(lambda: [heapq.heappush(items, x) for x in xs])
+    print('heapq.heappush  %8.0f ops/s' % (n / seconds))
+    seconds = timed(lambda: [heapq.heappop(items) for _ in xs])
+    print('heapq.heappop   %8.0f ops/s' % (n / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,94 @@
+'''
+Shows that level order traversals now scale linearly with the size of the tree.
+The old Queue inserted at the front of a list, which is O(width) per enqueue,
+so the traversals were quadratic in the width of the tree.
+
+For complete trees of 2^k - 1 nodes, the time per node should stay roughly flat as k grows.
+The old list-based queue is only timed for the smaller trees because it quickly becomes too slow.
+
+Run from the root of the repository:
+
+    python -m benchmarks.levelorder_scaling [max_levels]
+'''
+
+import sys
+import time
+
+from Trees.BinaryTree import BinaryTree, Node
+
+
+class ListQueue(object):
+    '''
+    The Queue as it was before it was rebuilt on collections.deque.
+    '''
+    def __init__(self):
+        self.items = []
+
+    def enqueue(self, item):
+        self.items.insert(0, item)
+
+    def dequeue(self):
+        return self.items.pop()
+
+    def __len__(self):
+        return len(self.items)
+
+
+def levelorder_with_list_queue(start):
+    traversal = []
+    queue = ListQueue()
+    queue.enqueue(start)
+    while len(queue) > 0:
+        node = queue.dequeue()
+        traversal.append(node.value)
+        if node.left:
+            queue.enqueue(node.left)
+        if node.right:
+            queue.enqueue(node.right)
+    return traversal
+
+
+def complete_tree(levels):
+    '''
+    Builds a complete tree with 2**levels - 1 nodes, one level at a time.
+    '''
+    tree = BinaryTree()
+    if levels == 0:
+        return tree
+    tree.root = Node(0)
+    level = [tree.root]
+    count = 1
+    for _ in range(levels - 1):
+        next_level = []
+        for node in level:
+            node.left = Node(count)
+            node.right = Node(count + 1)
+            count += 2
+            next_level.append(node.left)
+            next_level.append(node.right)
+        level = next_level
+    return tree
+
+
+def ns_per_node(n, f):
+    start = time.perf_counter()
+    f()
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def main(max_levels=20):
+    for levels in range(12, max_levels + 1):
+        tree = complete_tree(levels)
+        n = 2**levels - 1
+        line = 'n=%-8d levelorder %6.0f ns/node   reverse_levelorder %6.0f ns/node' % (
+            n,
+            ns_per_node(n, lambda: tree.to_list('levelorder')),
+            ns_per_node(n, lambda: tree.to_list('reverse_levelorder')),
+            )
+        if levels <= 17:
+            line += '   old list queue %8.0f ns/node' % ns_per_node(n, lambda: levelorder_with_list_queue(tree.root))
+        print(line)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+'''
+Compares the array-based Heap with the LeftistHeap on
+inserts, remove_mins, and melding many small heaps into one
+(the Heap has no meld, so the values of each small heap are inserted with insert_list).
+
+Run from the root of the repository:
+
+    python -m benchmarks.mergeable_heap [n] [heaps]
+'''
+
+import random
+import sys
+import time
+
+from Trees.Heap import Heap
+from Trees.LeftistHeap import LeftistHeap
+
+
+def timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def main(n=10**5, heaps=1000):
+    random.seed(0)
+    xs = [random.random() for _ in range(n)]
+    print('n=%d heaps=%d' % (n, heaps))
+
+    for cls in [Heap, LeftistHeap]:
+        heap = cls()
+        seconds = timed(lambda: [heap.insert(x) for x in xs])
+        print('%-11s insert     %9.0f ops/s' % (cls.__name__, n / seconds))
+        seconds = timed(lambda: [heap.remove_min() for _ in xs])
+        print('%-11s remove_min %9.0f ops/s' % (cls.__name__, n / seconds))
+
+    size = n // heaps
+    parts = [xs[i * size:(i + 1) * size] for i in range(heaps)]
+
+    small_heaps = [Heap(part) for part in parts]
+    small_leftists = [LeftistHeap(part) for part in parts]
+
+    def meld_heaps():
+        total = Heap()
+        for part in small_heaps:
+            total.insert_list(part.to_list('levelorder'))
+
+    def meld_leftist():
+        total = LeftistHeap()
+        for part in small_leftists:
+            total.meld(part)
+
+    print('Heap        meld all   %9.4fs' % timed(meld_heaps))
+    print('LeftistHeap meld all   %9.4fs' % timed(meld_leftist))
+
+    def mixed(cls):
+        heap = cls(xs[:1000])
+        for x in xs:
+            heap.insert(x)
+            heap.remove_min()
+
+    for cls in [Heap, LeftistHeap]:
+        print('%-11s push+pop   %9.0f ops/s' % (cls.__name__, 2 * n / timed(lambda: mixed(cls))))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
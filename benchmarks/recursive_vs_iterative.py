@@ -0,0 +1,117 @@
+'''
+Compares the throughput of the old recursive implementations of the BinaryTree/BST hot paths
+against the iterative implementations they were replaced with.
+
+Throughput is reported in millions of nodes visited per second,
+or millions of lookups per second for find.
+Two shapes of tree are measured:
+a perfectly balanced tree (where both versions work)
+and a degenerate chain built from sorted input (where the recursive versions hit the recursion limit).
+
+Run from the root of the repository:
+
+    python -m benchmarks.recursive_vs_iterative [n ...]
+'''
+
+import sys
+import time
+
+from Trees.BinaryTree import BinaryTree, Node
+from Trees.BST import BST
+
+
+################################################################################
+# the recursive implementations, as they were before being made iterative
+
+def inorder_recursive(start, traversal):
+    if start:
+        inorder_recursive(start.left, traversal)
+        traversal.append(start.value)
+        inorder_recursive(start.right, traversal)
+    return traversal
+
+def size_recursive(node):
+    if node is None:
+        return 0
+    return 1 + size_recursive(node.left) + size_recursive(node.right)
+
+def height_recursive(node):
+    if node is None:
+        return -1
+    return 1 + max(height_recursive(node.left), height_recursive(node.right))
+
+def find_recursive(value, node):
+    if value > node.value and node.right:
+        return find_recursive(value, node.right)
+    elif value < node.value and node.left:
+        return find_recursive(value, node.left)
+    if value == node.value:
+        return True
+
+
+################################################################################
+# tree builders
+
+def balanced(lo, hi):
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    node = Node(mid)
+    node.left = balanced(lo, mid)
+    node.right = balanced(mid + 1, hi)
+    return node
+
+def chain(n):
+    root = None
+    for value in reversed(range(n)):
+        node = Node(value)
+        node.right = root
+        root = node
+    return root
+
+
+def timed(f):
+    start = time.perf_counter()
+    try:
+        f()
+    except RecursionError:
+        return None
+    return time.perf_counter() - start
+
+def per_second(n, seconds):
+    if seconds is None:
+        return '   RecursionError'
+    return '%13.3f M/s' % (n / seconds / 1e6)
+
+
+def main(*sizes):
+    sizes = sizes or (10**4, 10**5, 10**6)
+    for shape, build in [('balanced', lambda n: balanced(0, n)), ('degenerate', chain)]:
+        for n in sizes:
+            tree = BST()
+            tree.root = build(n)
+            probes = list(range(0, n, max(1, n // 100)))
+            cases = [
+                ('inorder', n,
+                    lambda: inorder_recursive(tree.root, []),
+                    lambda: tree.inorder(tree.root, [])),
+                ('size', n,
+                    lambda: size_recursive(tree.root),
+                    lambda: tree.size_(tree.root)),
+                ('height', n,
+                    lambda: height_recursive(tree.root),
+                    lambda: BinaryTree._height(tree.root)),
+                ('find x%d' % len(probes), len(probes),
+                    lambda: [find_recursive(x, tree.root) for x in probes],
+                    lambda: [BST._find(x, tree.root) for x in probes]),
+                ]
+            for name, work, recursive, iterative in cases:
+                print('%-10s n=%-8d %-10s recursive %s   iterative %s' % (
+                    shape, n, name,
+                    per_second(work, timed(recursive)),
+                    per_second(work, timed(iterative)),
+                    ))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,66 @@
+'''
+Compares three ways of getting an AVLTree of n ints back from disk:
+unpickling a to_list and inserting every value (the old way),
+AVLTree.load (an O(n) bulk build from the binary format),
+and opening a MappedTree (which builds nothing) and answering a query.
+
+Run from the root of the repository:
+
+    python -m benchmarks.tree_load [n]
+'''
+
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+from Trees.AVLTree import AVLTree
+from Trees.MappedTree import MappedTree
+
+
+def timed(f):
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+def main(n=10**6):
+    random.seed(0)
+    avl = AVLTree.from_iterable(random.sample(range(10 * n), n))
+    print('n=%d' % n)
+    directory = tempfile.mkdtemp()
+    pickled = os.path.join(directory, 'tree.pickle')
+    binary = os.path.join(directory, 'tree.bin')
+    with open(pickled, 'wb') as fp:
+        pickle.dump(avl.to_list('inorder'), fp)
+    with open(binary, 'wb') as fp:
+        avl.dump(fp)
+    print('pickle size     %10d bytes' % os.path.getsize(pickled))
+    print('binary size     %10d bytes' % os.path.getsize(binary))
+
+    def reinsert():
+        with open(pickled, 'rb') as fp:
+            tree = AVLTree()
+            for x in pickle.load(fp):
+                tree.insert(x)
+
+    def load():
+        with open(binary, 'rb') as fp:
+            AVLTree.load(fp)
+
+    def mapped():
+        with MappedTree(binary) as tree:
+            tree.find(n)
+
+    print('pickle+insert   %8.3fs' % timed(reinsert))
+    print('AVLTree.load    %8.3fs' % timed(load))
+    print('MappedTree      %8.5fs' % timed(mapped))
+    os.remove(pickled)
+    os.remove(binary)
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,16 @@
+import io
+import pytest
+
+
+@pytest.fixture(scope='session')
+def roundtrip():
+    '''
+    Returns a function that dumps tree into an in-memory file and loads it back with cls.
+    The function returns the loaded tree and the number of bytes that were written.
+    '''
+    def roundtrip(tree, cls):
+        fp = io.BytesIO()
+        tree.dump(fp)
+        fp.seek(0)
+        return cls.load(fp), len(fp.getvalue())
+    return roundtrip
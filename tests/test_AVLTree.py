@@ -2,6 +2,9 @@ from Trees.BinaryTree import BinaryTree, Node
 from Trees.BST import BST
 from Trees.AVLTree import AVLTree
 
+import copy
+import pytest
+
 ################################################################################
 # these tests are specific for AVLTree rotations
 
@@ -40,19 +43,19 @@ avltree4.root.right.right = Node(9)
 
 def test__AVLTree__left_rotate0():
     rotated = AVLTree()
-    rotated.root = AVLTree._left_rotate(avltree0.root)
+    rotated.root = AVLTree._left_rotate(copy.deepcopy(avltree0.root))
     assert rotated.is_bst_satisfied()
     assert rotated.to_list('inorder') == avltree0.to_list('inorder')
 
 def test__AVLTree__left_rotate1():
     rotated = AVLTree()
-    rotated.root = AVLTree._left_rotate(avltree1.root)
+    rotated.root = AVLTree._left_rotate(copy.deepcopy(avltree1.root))
     assert rotated.is_bst_satisfied()
     assert rotated.to_list('inorder') == avltree1.to_list('inorder')
 
 def test__AVLTree__left_rotate4():
     rotated = AVLTree()
-    rotated.root = AVLTree._left_rotate(avltree4.root)
+    rotated.root = AVLTree._left_rotate(copy.deepcopy(avltree4.root))
     print('avltree4=',avltree4)
     print('rotated=',rotated)
     assert rotated.is_bst_satisfied()
@@ -60,24 +63,44 @@ def test__AVLTree__left_rotate4():
 
 def test__AVLTree__right_rotate2():
     rotated = AVLTree()
-    rotated.root = AVLTree._right_rotate(avltree2.root)
+    rotated.root = AVLTree._right_rotate(copy.deepcopy(avltree2.root))
     assert rotated.is_bst_satisfied()
     assert rotated.to_list('inorder') == avltree2.to_list('inorder')
 
 def test__AVLTree__right_rotate3():
     rotated = AVLTree()
-    rotated.root = AVLTree._right_rotate(avltree3.root)
+    rotated.root = AVLTree._right_rotate(copy.deepcopy(avltree3.root))
     assert rotated.is_bst_satisfied()
     assert rotated.to_list('inorder') == avltree3.to_list('inorder')
 
 def test__AVLTree__right_rotate4():
     rotated = AVLTree()
-    rotated.root = AVLTree._right_rotate(avltree4.root)
+    rotated.root = AVLTree._right_rotate(copy.deepcopy(avltree4.root))
     print('avltree4=',avltree4)
     print('rotated=',rotated)
     assert rotated.is_bst_satisfied()
     assert rotated.to_list('inorder') == avltree4.to_list('inorder')
 
+def test__AVLTree__rotate_in_place():
+    '''
+    Rotations relink the existing nodes instead of allocating new ones,
+    so references to nodes taken before the rotation remain valid.
+    '''
+    avl = AVLTree([2, 1, 4, 3, 5])
+    old_root = avl.root
+    old_right = avl.root.right
+    avl.root = AVLTree._left_rotate(avl.root)
+    assert avl.root is old_right
+    assert avl.root.left is old_root
+    assert avl.is_bst_satisfied()
+    assert avl.height() == BinaryTree._height(avl.root)
+    assert avl.root.left.height == BinaryTree._height(avl.root.left)
+
+    avl.root = AVLTree._right_rotate(avl.root)
+    assert avl.root is old_root
+    assert avl.root.right is old_right
+    assert avl.is_avl_satisfied()
+
 
 ################################################################################
 # These tests are all copied from the BST tests
@@ -183,7 +206,6 @@ def test__AVLTree_is_avl_satisified9():
 ################################################################################
 
 import random
-import copy
 from hypothesis import given
 import hypothesis.strategies as st
 ints = st.lists(st.integers())
@@ -217,6 +239,27 @@ def test__AVLTree___init__(xs):
     assert avl.is_avl_satisfied()
 
 
+@given(xs=ints)
+def test__AVLTree_cached_height(xs):
+    '''
+    The heights cached in the nodes must agree with the heights computed by walking the tree.
+    '''
+    xs = list(set(xs))
+    avl = AVLTree(xs)
+    assert avl.height() == BinaryTree._height(avl.root)
+    assert avl.balance_factor() in [-1, 0, 1]
+
+
+def test__AVLTree_insert_sorted():
+    '''
+    Sorted input is the worst case for an unbalanced BST,
+    but the AVLTree must stay logarithmic in height.
+    '''
+    avl = AVLTree(range(2**12))
+    assert avl.is_avl_satisfied()
+    assert avl.height() == 12
+
+
 # NOTE: 
 # We are NOT testing the following functions: 
 #   __contains__
@@ -228,9 +271,9 @@ def test__AVLTree___init__(xs):
 # we know that these functions are guaranteed to continue working.
 
 # NOTE:
-# I am not having you implement the remove function,
-# and therefore the following test cases are commented out.
-"""
+# The AVLTree overrides the remove and remove_list functions it inherits from the BST,
+# because the BST versions never rebalance the tree.
+
 @given(xs=ints)
 def test__AVLTree_remove1(xs):
     '''
@@ -273,7 +316,44 @@ def test__AVLTree_remove_list(xs,ys):
     avl.remove_list(ys)
     for y in ys:
         assert y not in avl
-"""
+
+
+@given(xs=ints, ys=ints)
+def test__AVLTree_remove_list2(xs,ys):
+    '''
+    remove_list removes a whole batch in one pass,
+    which can leave subtrees of very different heights that must be joined back together.
+    '''
+    xs = list(set(xs))
+    avl = AVLTree(xs)
+    avl.remove_list(ys + xs[::2])
+    expected = sorted(set(xs) - set(ys) - set(xs[::2]))
+    assert avl.to_list('inorder') == expected
+    assert avl.is_bst_satisfied()
+    assert avl.is_avl_satisfied()
+
+
+def test__AVLTree_remove_list_range():
+    avl = AVLTree(range(1000))
+    avl.remove_list(range(100, 900))
+    assert avl.to_list('inorder') == list(range(100)) + list(range(900, 1000))
+    assert avl.is_avl_satisfied()
+
+
+@given(xs=ints,ys=ints)
+def test__AVLTree_remove_and_insert(xs,ys):
+    '''
+    This test performs a mixture of both insertions and removals.
+    This ensures that there are no weird interactions between inserting and removing.
+    '''
+    xs = list(set(xs))
+    avl = AVLTree(xs)
+    for y in ys:
+        avl.insert(y)
+        x = random.choice(avl.to_list('inorder'))
+        avl.remove(x)
+        assert avl.is_bst_satisfied()
+        assert avl.is_avl_satisfied()
 
 @given(xs=ints)
 def test__AVLTree_inorder_property(xs):
@@ -298,3 +378,166 @@ def test__AVLTree_inorder_property(xs):
     bst2 = AVLTree(xs2)
     
     assert bst1.to_list('inorder') == bst2.to_list('inorder')
+
+
+@given(xs=ints)
+def test__AVLTree_from_iterable(xs):
+    avl = AVLTree.from_iterable(xs)
+    assert isinstance(avl, AVLTree)
+    assert avl.is_avl_satisfied()
+    assert avl.to_list('inorder') == sorted(set(xs))
+    avl.insert_list(xs)
+    avl.remove_list(xs[::2])
+    assert avl.is_avl_satisfied()
+
+
+@given(xs=ints, ys=ints)
+def test__AVLTree_insert_list_sorted(xs, ys):
+    xs = list(set(xs))
+    ys = sorted(ys + list(range(100)))
+    avl = AVLTree(xs)
+    avl.insert_list(ys)
+    assert avl.is_avl_satisfied()
+    assert avl.to_list('inorder') == sorted(set(xs + ys))
+
+
+@given(xs=ints, ys=ints)
+def test__AVLTree_select_rank(xs, ys):
+    '''
+    The cached subtree sizes must stay correct through rotations, removes and batched removes.
+    '''
+    xs = list(set(xs))
+    avl = AVLTree(xs)
+    for y in ys[:10]:
+        avl.insert(y)
+        avl.remove(y // 2)
+    avl.remove_list(ys[10:])
+    values = avl.to_list('inorder')
+    assert len(avl) == len(values)
+    assert avl.is_bst_satisfied()
+    for k, value in enumerate(values):
+        assert avl.select(k) == value
+        assert avl.rank(value) == k
+
+
+@given(xs=ints, lo=st.integers(), hi=st.integers())
+def test__AVLTree_irange(xs, lo, hi):
+    xs = list(set(xs))
+    avl = AVLTree(xs)
+    expected = [x for x in sorted(xs) if lo <= x <= hi]
+    assert list(avl.irange(lo, hi)) == expected
+    assert avl.count_range(lo, hi) == len(expected)
+
+
+@given(xs=ints, y=st.integers())
+def test__AVLTree_floor_ceiling(xs, y):
+    xs = list(set(xs))
+    avl = AVLTree(xs)
+    below = [x for x in xs if x <= y]
+    above = [x for x in xs if x > y]
+    assert avl.floor(y) == (max(below) if below else None)
+    assert avl.successor(y) == (min(above) if above else None)
+    assert avl.nearest(y, 3) == sorted(xs, key=lambda x: (abs(x - y), x))[:3]
+
+
+@given(ints, ints)
+def test__AVLTree_set_operations(xs, ys):
+    a = AVLTree(xs)
+    b = AVLTree(ys)
+    for c, expected in [
+        (a.union(b), set(xs) | set(ys)),
+        (a.intersection(b), set(xs) & set(ys)),
+        (a.difference(b), set(xs) - set(ys)),
+        (a.symmetric_difference(b), set(xs) ^ set(ys)),
+    ]:
+        assert type(c) == AVLTree
+        assert c.is_avl_satisfied()
+        assert list(c) == sorted(expected)
+    c = a | b
+    c.insert(max(xs + ys, default=0) + 1)
+    assert c.is_avl_satisfied()
+    assert list(a) == sorted(set(xs))
+
+
+@given(ints, st.integers())
+def test__AVLTree_split(xs, key):
+    avl = AVLTree(xs)
+    lt, ge = avl.split(key)
+    assert len(avl) == 0
+    assert lt.is_avl_satisfied()
+    assert ge.is_avl_satisfied()
+    assert list(lt) == sorted(x for x in set(xs) if x < key)
+    assert list(ge) == sorted(x for x in set(xs) if x >= key)
+    joined = AVLTree.join(lt, ge)
+    assert joined.is_avl_satisfied()
+    assert list(joined) == sorted(set(xs))
+    assert len(lt) == len(ge) == 0
+
+
+@given(ints, ints)
+def test__AVLTree_join(xs, ys):
+    if xs and ys:
+        ys = [y - min(ys) + max(xs) + 1 for y in ys]
+    joined = AVLTree.join(AVLTree(xs), AVLTree(ys))
+    assert joined.is_avl_satisfied()
+    assert list(joined) == sorted(set(xs)) + sorted(set(ys))
+
+
+def test__AVLTree_join_overlapping():
+    with pytest.raises(ValueError):
+        AVLTree.join(AVLTree([1, 5]), AVLTree([3]))
+
+
+@given(ints, st.integers(), st.integers(), st.booleans(), st.booleans())
+def test__AVLTree_remove_range(xs, lo, hi, lo_inclusive, hi_inclusive):
+    avl = AVLTree(xs)
+    kept = [x for x in avl if x not in set(avl.irange(lo, hi, (lo_inclusive, hi_inclusive)))]
+    avl.remove_range(lo, hi, (lo_inclusive, hi_inclusive))
+    assert avl.is_avl_satisfied()
+    assert list(avl) == kept
+
+
+@given(ints, st.integers())
+def test__AVLTree_remove_range_unbounded(xs, lo):
+    avl = AVLTree(xs)
+    avl.remove_range(lo=lo)
+    assert list(avl) == sorted(x for x in set(xs) if x < lo)
+    avl = AVLTree(xs)
+    avl.remove_range(hi=lo)
+    assert list(avl) == sorted(x for x in set(xs) if x > lo)
+
+
+@given(ints)
+def test__AVLTree_dump_load(roundtrip, xs):
+    avl, _ = roundtrip(AVLTree(xs), AVLTree)
+    assert type(avl) == AVLTree
+    assert avl.is_avl_satisfied()
+    assert list(avl) == sorted(set(xs))
+
+
+@given(st.lists(st.floats(allow_nan=False)))
+def test__AVLTree_dump_load_floats(roundtrip, xs):
+    avl, _ = roundtrip(AVLTree(xs), AVLTree)
+    assert list(avl) == sorted(set(xs))
+
+
+@given(st.lists(st.text()))
+def test__AVLTree_dump_load_pickled(roundtrip, xs):
+    avl, _ = roundtrip(AVLTree(xs), AVLTree)
+    assert list(avl) == sorted(set(xs))
+
+
+def test__AVLTree_dump_compact(roundtrip):
+    _, size = roundtrip(AVLTree(range(1000)), AVLTree)
+    assert size == 16 + 8 * 1000
+
+
+@given(ints)
+def test__AVLTree__insert(xs):
+    root = None
+    for x in xs:
+        root = AVLTree._insert(x, root)
+    avl = AVLTree()
+    avl.root = root
+    assert avl.is_avl_satisfied()
+    assert list(avl) == sorted(set(xs))
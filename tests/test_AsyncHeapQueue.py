@@ -0,0 +1,102 @@
+from Trees.AsyncHeapQueue import AsyncHeapQueue
+
+import asyncio
+import pytest
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@given(ints)
+def test__AsyncHeapQueue_order(xs):
+    async def main():
+        queue = AsyncHeapQueue()
+        for i, x in enumerate(xs):
+            await queue.put(i, x)
+        return [await queue.get() for _ in xs]
+    order = _run(main())
+    assert order == sorted(range(len(xs)), key=lambda i: (xs[i], i))
+
+
+def test__AsyncHeapQueue_unorderable_items():
+    queue = AsyncHeapQueue()
+    queue.put_nowait({'a': 1}, 1)
+    queue.put_nowait({'b': 2}, 1)
+    queue.put_nowait({'c': 3}, 0)
+    assert queue.peek_nowait() == {'c': 3}
+    assert [queue.get_nowait() for _ in range(3)] == [{'c': 3}, {'a': 1}, {'b': 2}]
+
+
+def test__AsyncHeapQueue_nowait():
+    queue = AsyncHeapQueue(maxsize=1)
+    with pytest.raises(asyncio.QueueEmpty):
+        queue.get_nowait()
+    queue.put_nowait('a', 0)
+    assert queue.full()
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait('b', 0)
+
+
+def test__AsyncHeapQueue_get_waits():
+    async def main():
+        queue = AsyncHeapQueue()
+        getter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        await queue.put('a', 5)
+        return await asyncio.wait_for(getter, 1)
+    assert _run(main()) == 'a'
+
+
+def test__AsyncHeapQueue_maxsize():
+    async def main():
+        queue = AsyncHeapQueue(maxsize=2)
+        await queue.put('a', 1)
+        await queue.put('b', 2)
+        putter = asyncio.ensure_future(queue.put('c', 0))
+        await asyncio.sleep(0)
+        assert not putter.done()
+        assert queue.qsize() == 2
+        assert await queue.get() == 'a'
+        await asyncio.wait_for(putter, 1)
+        return [queue.get_nowait() for _ in range(2)]
+    assert _run(main()) == ['c', 'b']
+
+
+def test__AsyncHeapQueue_producers_consumers():
+    async def main():
+        queue = AsyncHeapQueue(maxsize=10)
+        results = []
+
+        async def producer(i):
+            for j in range(50):
+                await queue.put((i, j), j)
+
+        async def consumer():
+            while True:
+                results.append(await queue.get())
+                queue.task_done()
+        consumers = [asyncio.ensure_future(consumer()) for _ in range(3)]
+        await asyncio.gather(*[producer(i) for i in range(5)])
+        await asyncio.wait_for(queue.join(), 5)
+        for c in consumers:
+            c.cancel()
+        return results
+    results = _run(main())
+    assert sorted(results) == sorted((i, j) for i in range(5) for j in range(50))
+
+
+def test__AsyncHeapQueue_task_done_too_often():
+    queue = AsyncHeapQueue()
+    with pytest.raises(ValueError):
+        queue.task_done()
@@ -1,5 +1,6 @@
 from Trees.BinaryTree import BinaryTree, Node
 from Trees.BST import BST
+from Trees.Heap import Heap
 
 
 def test__BST_super():
@@ -61,6 +62,9 @@ def test__BST_is_bst_satisified5():
 
 import random
 import copy
+import itertools
+import io
+import pytest
 from hypothesis import given
 import hypothesis.strategies as st
 ints = st.lists(st.integers())
@@ -259,3 +263,214 @@ def test__BST_inorder_property(xs):
     bst2 = BST(xs2)
     
     assert bst1.to_list('inorder') == bst2.to_list('inorder')
+
+
+@given(xs=ints)
+def test__BST___iter__(xs):
+    '''
+    Iterating over a BST yields its values in sorted order,
+    and the iterator can be abandoned part way through.
+    '''
+    xs = list(set(xs))
+    bst = BST(xs)
+    assert list(bst) == sorted(xs)
+    assert list(itertools.islice(bst, 3)) == sorted(xs)[:3]
+
+
+def test__BST_degenerate():
+    '''
+    Inserting sorted input one value at a time builds a BST that is just a long chain of right children.
+    Every operation must work on it even though it is far deeper than Python's recursion limit.
+    '''
+    n = 5000
+    bst = BST()
+    for x in range(n):
+        bst.insert(x)
+    assert bst.height() == n - 1
+    assert len(bst) == n
+    assert bst.is_bst_satisfied()
+    assert bst.to_list('inorder') == list(range(n))
+    assert bst.to_list('postorder') == list(range(n))[::-1]
+    assert bst.find(n - 1)
+    assert not bst.find(n)
+    assert bst.find_largest() == n - 1
+    bst.remove_list(range(0, n, 2))
+    assert bst.to_list('inorder') == list(range(1, n, 2))
+
+
+@given(xs=ints)
+def test__BST_from_sorted(xs):
+    xs = sorted(set(xs))
+    bst = BST.from_sorted(xs)
+    assert bst.is_bst_satisfied()
+    assert bst.to_list('inorder') == xs
+    if xs:
+        assert 2**bst.height() <= len(xs) < 2**(bst.height() + 1)
+
+
+@given(xs=ints)
+def test__BST_from_iterable(xs):
+    bst = BST.from_iterable(xs)
+    assert bst.is_bst_satisfied()
+    assert bst.to_list('inorder') == sorted(set(xs))
+
+
+def test__BST_from_sorted_unsorted():
+    try:
+        BST.from_sorted([1, 3, 2])
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+@given(xs=ints, ys=ints)
+def test__BST_insert_list_sorted(xs, ys):
+    '''
+    Large sorted batches are merged into the tree and the whole tree is rebuilt.
+    '''
+    xs = list(set(xs))
+    ys = sorted(ys + list(range(100)))
+    bst = BST(xs)
+    bst.insert_list(ys)
+    assert bst.is_bst_satisfied()
+    assert bst.to_list('inorder') == sorted(set(xs + ys))
+
+
+def test__BST_insert_list_sorted_balanced():
+    bst = BST(range(10000))
+    assert bst.height() == 13
+
+
+@given(xs=ints, ys=ints)
+def test__BST_select_rank(xs, ys):
+    '''
+    The cached subtree sizes must stay correct through inserts and removes.
+    '''
+    xs = list(set(xs))
+    bst = BST(xs)
+    bst.remove_list(ys)
+    bst.insert_list(ys[::2])
+    values = bst.to_list('inorder')
+    assert len(bst) == len(values)
+    assert bst.is_bst_satisfied()
+    for k, value in enumerate(values):
+        assert bst.select(k) == value
+        assert bst.select(k - len(values)) == value
+        assert bst.rank(value) == k
+    if values:
+        assert bst.rank(values[0] - 1) == 0
+        assert bst.rank(values[-1] + 1) == len(values)
+
+
+def test__BST_select_out_of_range():
+    for bst in [BST(), BST([1, 2, 3])]:
+        for k in [len(bst), -len(bst) - 1]:
+            try:
+                bst.select(k)
+            except IndexError:
+                pass
+            else:
+                assert False
+
+
+@given(xs=st.lists(st.integers(), min_size=1))
+def test__BST_median_percentile(xs):
+    xs = sorted(set(xs))
+    bst = BST(xs)
+    assert bst.median() == xs[(len(xs) - 1) // 2]
+    assert bst.percentile(0) == xs[0]
+    assert bst.percentile(100) == xs[-1]
+    for p in [1, 25, 50, 90, 99]:
+        value = bst.percentile(p)
+        assert 100 * len([x for x in xs if x <= value]) >= p * len(xs)
+        assert 100 * len([x for x in xs if x < value]) < p * len(xs)
+
+
+@given(xs=ints, lo=st.integers(), hi=st.integers(), inclusive=st.tuples(st.booleans(), st.booleans()))
+def test__BST_irange(xs, lo, hi, inclusive):
+    xs = list(set(xs + [lo, hi]))
+    bst = BST(xs)
+    expected = [x for x in sorted(xs)
+                if (lo < x or (inclusive[0] and lo == x))
+                and (x < hi or (inclusive[1] and x == hi))]
+    assert list(bst.irange(lo, hi, inclusive)) == expected
+    assert list(bst.irange(lo, hi, inclusive, reverse=True)) == expected[::-1]
+    assert bst.count_range(lo, hi, inclusive) == len(expected)
+
+
+@given(xs=ints, lo=st.integers())
+def test__BST_irange_unbounded(xs, lo):
+    xs = list(set(xs))
+    bst = BST(xs)
+    assert list(bst.irange()) == sorted(xs)
+    assert list(bst.irange(lo)) == [x for x in sorted(xs) if x >= lo]
+    assert list(bst.irange(hi=lo, reverse=True)) == [x for x in sorted(xs, reverse=True) if x <= lo]
+    assert bst.count_range(lo) == len([x for x in xs if x >= lo])
+    assert bst.count_range() == len(xs)
+
+
+@given(xs=ints, y=st.integers())
+def test__BST_floor_ceiling(xs, y):
+    xs = list(set(xs))
+    bst = BST(xs)
+    below = [x for x in xs if x < y]
+    above = [x for x in xs if x > y]
+    at = [y] if y in xs else []
+    assert bst.predecessor(y) == (max(below) if below else None)
+    assert bst.successor(y) == (min(above) if above else None)
+    assert bst.floor(y) == (max(below + at) if below + at else None)
+    assert bst.ceiling(y) == (min(above + at) if above + at else None)
+
+
+@given(xs=ints, y=st.integers(), k=st.integers(min_value=0, max_value=10))
+def test__BST_nearest(xs, y, k):
+    xs = list(set(xs))
+    bst = BST(xs)
+    expected = sorted(xs, key=lambda x: (abs(x - y), x))[:k]
+    assert bst.nearest(y, k) == expected
+
+
+def test__BST_find_missing():
+    '''
+    find returns False (not None) when the value is missing.
+    '''
+    bst = BST([2, 1, 3])
+    assert bst.find(4) is False
+    assert BST().find(4) is False
+    assert bst.find(3) is True
+
+
+@given(ints, ints)
+def test__BST_set_operations(xs, ys):
+    a = BST(xs)
+    b = BST(ys)
+    assert list(a | b) == sorted(set(xs) | set(ys))
+    assert list(a & b) == sorted(set(xs) & set(ys))
+    assert list(a - b) == sorted(set(xs) - set(ys))
+    assert list(a ^ b) == sorted(set(xs) ^ set(ys))
+    for c in [a | b, a & b, a - b, a ^ b]:
+        assert type(c) == BST
+        assert c.is_bst_satisfied()
+    assert list(a) == sorted(set(xs))
+
+
+@given(ints)
+def test__BST_dump_load(roundtrip, xs):
+    bst, _ = roundtrip(BST(xs), BST)
+    assert type(bst) == BST
+    assert bst.is_bst_satisfied()
+    assert list(bst) == sorted(set(xs))
+
+
+def test__BST_load_not_a_tree():
+    with pytest.raises(ValueError):
+        BST.load(io.BytesIO(b'not a tree file at all'))
+
+
+def test__BST_load_heap_file():
+    fp = io.BytesIO()
+    Heap([3, 1, 2]).dump(fp)
+    fp.seek(0)
+    with pytest.raises(ValueError):
+        BST.load(fp)
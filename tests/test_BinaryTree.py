@@ -1,4 +1,9 @@
 from Trees.BinaryTree import BinaryTree, Node
+from Trees.BST import BSTNode
+from Trees.AVLTree import AVLNode
+
+import io
+import tracemalloc
 
 
 _example0 = BinaryTree()
@@ -27,6 +32,13 @@ _example2.root.right = Node(12)
 _example2.root.right.right = Node(13)
 _example2.root.right.right.right = Node(14)
 
+_example4 = BinaryTree()
+_example4.root = Node(0)
+_node = _example4.root
+for _i in range(1, 5000):
+    _node.left = Node(_i)
+    _node = _node.left
+
 _example3 = BinaryTree()
 _example3.root = Node(0)
 _example3.root.left = Node(1)
@@ -74,6 +86,30 @@ def test__BinaryTree_postorder_print3():
     assert _example3.print_tree('postorder') == '6-7-5-4-3-9-10-8-2-11-1-14-13-12-0-1-6-7-5-4-3-9-10-8-2-11-1-14-13-12-0-0-'
 
 
+def test__BinaryTree_write_tree():
+    '''
+    write_tree must write exactly what print_tree returns.
+    '''
+    for example in [_example0, _example1, _example2, _example3, _example4]:
+        for traversal_type in ['preorder', 'inorder', 'postorder', 'levelorder', 'reverse_levelorder']:
+            fp = io.StringIO()
+            example.write_tree(fp, traversal_type)
+            assert fp.getvalue() == (example.print_tree(traversal_type) or '')
+
+def test__BinaryTree_write_tree_invalid():
+    try:
+        _example1.write_tree(io.StringIO(), 'sideways')
+    except ValueError:
+        pass
+    else:
+        assert False
+
+
+def test__Node___str__():
+    assert str(_example1.root) == '(1 - (2 - (4 - - ) - (5 - - ) ) - (3 - - ) )'
+    assert str(_example4) == ''.join('(%d - ' % i for i in range(4999)) + '(4999 - - )' + ' - )' * 4999
+
+
 def test__BinaryTree_preorder0():
     assert _example0.to_list('preorder') == []
 
@@ -113,6 +149,41 @@ def test__BinaryTree_postorder3():
     assert _example3.to_list('postorder') == [6, 7, 5, 4, 3, 9, 10, 8, 2, 11, 1, 14, 13, 12, 0, 1, 6, 7, 5, 4, 3, 9, 10, 8, 2, 11, 1, 14, 13, 12, 0, 0]
 
 
+def test__BinaryTree_traversals4():
+    '''
+    _example4 is a chain of left children that is deeper than Python's recursion limit.
+    '''
+    assert _example4.to_list('preorder') == list(range(5000))
+    assert _example4.to_list('inorder') == list(range(5000))[::-1]
+    assert _example4.to_list('postorder') == list(range(5000))[::-1]
+
+
+def test__BinaryTree_levelorder0():
+    assert _example0.to_list('levelorder') == []
+
+def test__BinaryTree_levelorder1():
+    assert _example1.to_list('levelorder') == [1, 2, 3, 4, 5]
+
+def test__BinaryTree_levelorder2():
+    assert _example2.to_list('levelorder') == [0, 1, 12, 2, 11, 13, 3, 8, 14, 4, 9, 10, 5, 6, 7]
+
+
+def test__BinaryTree_reverse_levelorder0():
+    assert _example0.to_list('reverse_levelorder') == []
+
+def test__BinaryTree_reverse_levelorder1():
+    assert _example1.to_list('reverse_levelorder') == [4, 5, 2, 3, 1]
+
+def test__BinaryTree_reverse_levelorder2():
+    assert _example2.to_list('reverse_levelorder') == [6, 7, 5, 4, 9, 10, 3, 8, 14, 2, 11, 13, 1, 12, 0]
+
+def test__BinaryTree_levelorder_print():
+    for example in [_example1, _example2, _example3]:
+        for traversal_type in ['levelorder', 'reverse_levelorder']:
+            expected = ''.join(str(x) + '-' for x in example.to_list(traversal_type))
+            assert example.print_tree(traversal_type) == expected
+
+
 def test__BinaryTree_height0():
     assert _example0.height() == -1
 
@@ -125,6 +196,9 @@ def test__BinaryTree_height2():
 def test__BinaryTree_height3():
     assert _example3.height() == 8
 
+def test__BinaryTree_height4():
+    assert _example4.height() == 4999
+
 
 def test__BinaryTree_size0():
     assert _example0.size() == 0
@@ -138,6 +212,9 @@ def test__BinaryTree_size2():
 def test__BinaryTree_size3():
     assert _example3.size() == 32
 
+def test__BinaryTree_size4():
+    assert _example4.size() == 5000
+
 
 def test__BinaryTree_len0():
     assert len(_example0) == 0
@@ -150,3 +227,57 @@ def test__BinaryTree_len2():
 
 def test__BinaryTree_len3():
     assert len(_example3) == 32
+
+
+def test__BinaryTree_iter():
+    for example in [_example0, _example1, _example2, _example3]:
+        assert list(example) == example.to_list('inorder')
+        assert list(example.iter_preorder()) == example.to_list('preorder')
+        assert list(example.iter_inorder()) == example.to_list('inorder')
+        assert list(example.iter_postorder()) == example.to_list('postorder')
+
+def test__BinaryTree_iter_levelorder():
+    assert list(_example0.iter_levelorder()) == []
+    assert list(_example1.iter_levelorder()) == [1, 2, 3, 4, 5]
+    assert list(_example2.iter_levelorder()) == [0, 1, 12, 2, 11, 13, 3, 8, 14, 4, 9, 10, 5, 6, 7]
+
+def test__BinaryTree_iter_lazy():
+    '''
+    The iterators must produce values one at a time,
+    even for trees that are too deep to traverse recursively.
+    '''
+    assert next(iter(_example4)) == 4999
+    assert next(_example4.iter_preorder()) == 0
+    assert next(_example4.iter_postorder()) == 4999
+    assert next(_example4.iter_levelorder()) == 0
+
+
+################################################################################
+# memory benchmark for the node classes
+
+def _bytes_per_node(node_class, n=10000):
+    '''
+    Measures with tracemalloc how many bytes a chain of n nodes takes per node.
+    '''
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        root = None
+        for _ in range(n):
+            node = node_class(None)
+            node.left = root
+            root = node
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / n
+
+def test__Node_memory():
+    '''
+    The node classes use __slots__ instead of a per-instance __dict__,
+    so a node costs a few machine words rather than a full attribute dictionary.
+    '''
+    for node_class, fields in [(Node, 3), (BSTNode, 4), (AVLNode, 6)]:
+        assert not hasattr(node_class(None), '__dict__')
+        bytes_per_node = _bytes_per_node(node_class)
+        assert bytes_per_node < 40 + 8 * fields
@@ -0,0 +1,174 @@
+from Trees.AVLTree import AVLTree
+from Trees.BST import BST
+from Trees.Heap import Heap
+from Trees.ConcurrentTree import ConcurrentTree, ReadWriteLock
+
+import threading
+import pytest
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+def _run(threads):
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test__ReadWriteLock_readers_share():
+    lock = ReadWriteLock()
+    barrier = threading.Barrier(2, timeout=5)
+    errors = []
+
+    def reader():
+        with lock.read():
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError as e:
+                errors.append(e)
+    _run([threading.Thread(target=reader) for _ in range(2)])
+    assert not errors
+
+
+def test__ReadWriteLock_writer_excludes():
+    lock = ReadWriteLock()
+    inside = []
+    overlaps = []
+
+    def worker(i):
+        for _ in range(200):
+            if i % 2:
+                with lock.write():
+                    inside.append('w')
+                    if len(inside) != 1:
+                        overlaps.append(list(inside))
+                    inside.remove('w')
+            else:
+                with lock.read():
+                    inside.append('r')
+                    if 'w' in inside:
+                        overlaps.append(list(inside))
+                    inside.remove('r')
+    _run([threading.Thread(target=worker, args=(i,)) for i in range(8)])
+    assert not overlaps
+
+
+@given(ints)
+def test__ConcurrentTree_forwards(xs):
+    tree = ConcurrentTree(AVLTree(xs))
+    assert len(tree) == len(set(xs))
+    assert list(tree) == sorted(set(xs))
+    assert tree.to_list('inorder') == sorted(set(xs))
+    assert tree.irange() == sorted(set(xs))
+    for x in xs:
+        assert x in tree
+        assert tree.find(x)
+    tree.insert(0)
+    tree.remove_list(xs)
+    assert list(tree) == ([] if 0 in xs else [0])
+
+
+def test__ConcurrentTree_parallel_writes():
+    tree = ConcurrentTree(AVLTree())
+
+    def writer(i):
+        for j in range(200):
+            tree.insert(i * 1000 + j)
+        tree.insert_list(range(i * 1000 + 200, i * 1000 + 400))
+        for j in range(0, 400, 2):
+            tree.remove(i * 1000 + j)
+    _run([threading.Thread(target=writer, args=(i,)) for i in range(8)])
+    assert tree.is_avl_satisfied()
+    assert list(tree) == sorted(i * 1000 + j for i in range(8) for j in range(1, 400, 2))
+
+
+def test__ConcurrentTree_readers_see_whole_batches():
+    tree = ConcurrentTree(BST())
+    errors = []
+    done = threading.Event()
+
+    def writer():
+        for i in range(100):
+            with tree.writing() as t:
+                t.insert(2 * i)
+                t.insert(2 * i + 1)
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            if len(tree) % 2:
+                errors.append(len(tree))
+    _run([threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)])
+    assert not errors
+    assert len(tree) == 200
+
+
+def test__ConcurrentTree_heap():
+    heap = ConcurrentTree(Heap())
+
+    def writer(i):
+        heap.insert_list(range(i, 1000, 4))
+    _run([threading.Thread(target=writer, args=(i,)) for i in range(4)])
+    assert heap.is_heap_satisfied()
+    assert [heap.remove_min() for _ in range(1000)] == list(range(1000))
+
+
+@given(ints, ints)
+def test__ConcurrentTree_set_operators(xs, ys):
+    a = ConcurrentTree(AVLTree(xs))
+    b = ConcurrentTree(AVLTree(ys))
+    assert list(a | b) == sorted(set(xs) | set(ys))
+    assert list(a & b) == sorted(set(xs) & set(ys))
+    assert list(a - b) == sorted(set(xs) - set(ys))
+    assert list(a ^ b) == sorted(set(xs) ^ set(ys))
+    assert list(a | AVLTree(ys)) == sorted(set(xs) | set(ys))
+    assert list(a.union(b)) == sorted(set(xs) | set(ys))
+    assert list(a & a) == sorted(set(xs))
+
+
+def test__ConcurrentTree_root_not_exposed():
+    tree = ConcurrentTree(AVLTree([1, 2, 3]))
+    with pytest.raises(AttributeError):
+        tree.root
+    with tree.reading() as t:
+        assert t.root.value == 2
+
+
+def test__ConcurrentTree_set_operations_lock_other():
+    '''
+    While one thread keeps filling and emptying b,
+    a | b and b - a must always see b either full or empty, never halfway through a batch.
+    Half of the readers combine the trees in the opposite order, which must not deadlock.
+    '''
+    a = ConcurrentTree(AVLTree(range(1, 1000, 2)))
+    b = ConcurrentTree(AVLTree())
+    full = list(range(1000))
+    errors = []
+    done = threading.Event()
+
+    def writer():
+        for _ in range(20):
+            with b.writing() as t:
+                for x in full:
+                    t.insert(x)
+            with b.writing() as t:
+                for x in full:
+                    t.remove(x)
+        done.set()
+
+    def reader(i):
+        while not done.is_set():
+            if i % 2:
+                c = a | b
+                if list(c) not in (list(range(1, 1000, 2)), full) or not c.is_avl_satisfied():
+                    errors.append(len(c))
+            else:
+                c = b - a
+                if list(c) not in ([], list(range(0, 1000, 2))) or not c.is_avl_satisfied():
+                    errors.append(len(c))
+    _run([threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(4)])
+    assert not errors
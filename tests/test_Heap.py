@@ -1,6 +1,8 @@
 from Trees.BinaryTree import BinaryTree, Node
 from Trees.Heap import Heap
 
+import pytest
+
 
 def test__Heap_super():
     x = Heap()
@@ -62,6 +64,24 @@ def test__Heap_is_heap_satisified6():
     heap.root.right.right = Node(-1)
     assert not heap.is_heap_satisfied()
 
+def test__Heap_is_heap_satisified_reverse():
+    heap = Heap(reverse=True)
+    heap.root = Node(5)
+    heap.root.left = Node(3)
+    heap.root.right = Node(4)
+    assert heap.is_heap_satisfied()
+    heap.root.right.left = Node(6)
+    assert not heap.is_heap_satisfied()
+
+def test__Heap_is_heap_satisified_key():
+    heap = Heap(key=abs)
+    heap.root = Node(1)
+    heap.root.left = Node(-2)
+    heap.root.right = Node(3)
+    assert heap.is_heap_satisfied()
+    heap.root.left.left = Node(-1)
+    assert not heap.is_heap_satisfied()
+
 ################################################################################
 
 import random
@@ -179,3 +199,143 @@ def test__Heap_remove_and_insert2(xs,ys):
         heap.insert(y)
         heap.remove_min()
         assert heap.is_heap_satisfied()
+
+
+@given(xs=ints)
+def test__Heap_remove_min_order(xs):
+    '''
+    Repeatedly removing the minimum must return the values in sorted order (this is heap sort).
+    '''
+    heap = Heap(xs)
+    assert len(heap) == len(xs)
+    assert [heap.remove_min() for _ in xs] == sorted(xs)
+    assert heap.remove_min() is None
+    assert len(heap) == 0
+
+
+@given(xs=ints, ys=ints)
+def test__Heap_insert_list_nonempty(xs, ys):
+    '''
+    insert_list takes a different path depending on how large the batch is compared to the heap.
+    '''
+    heap = Heap(xs)
+    heap.insert_list(ys)
+    assert heap.is_heap_satisfied()
+    assert sorted(heap.to_list('inorder')) == sorted(xs + ys)
+
+
+@given(xs=ints)
+def test__Heap___repr__(xs):
+    heap = Heap(xs)
+    heap2 = eval(repr(heap))
+    assert heap2.to_list('levelorder') == heap.to_list('levelorder')
+
+
+def test__Heap_root_assigned_by_hand():
+    '''
+    A tree assigned to root by hand becomes the contents of the heap,
+    even if it is not shaped like a complete tree.
+    '''
+    heap = Heap()
+    heap.root = Node(0)
+    heap.root.right = Node(1)
+    heap.root.right.right = Node(2)
+    assert heap.is_heap_satisfied()
+    assert len(heap) == 3
+    heap.insert(-1)
+    assert heap.is_heap_satisfied()
+    assert [heap.remove_min() for _ in range(4)] == [-1, 0, 1, 2]
+
+
+@given(xs=ints, ys=ints, arity=st.integers(min_value=2, max_value=9), reverse=st.booleans())
+def test__Heap_arity_reverse(xs, ys, arity, reverse):
+    heap = Heap(xs, reverse=reverse, arity=arity)
+    for y in ys:
+        heap.insert(y)
+        assert heap.is_heap_satisfied()
+    expected = sorted(xs + ys, reverse=reverse)
+    if expected:
+        assert heap.find_smallest() == expected[0]
+    assert [heap.remove_min() for _ in expected] == expected
+    assert heap.remove_min() is None
+
+
+@given(xs=ints, arity=st.integers(min_value=2, max_value=5))
+def test__Heap_key(xs, arity):
+    calls = []
+
+    def key(x):
+        calls.append(x)
+        return abs(x)
+    heap = Heap(xs, key=key, arity=arity)
+    heap.insert(0)
+    assert heap.is_heap_satisfied()
+    result = [heap.remove_min() for _ in range(len(xs) + 1)]
+    assert [abs(x) for x in result] == sorted(abs(x) for x in xs + [0])
+    assert len(calls) == len(xs) + 1
+
+
+def test__Heap_key_unorderable_values():
+    heap = Heap([{'p': 3}, {'p': 1}, {'p': 2}], key=lambda d: d['p'], reverse=True)
+    assert [heap.remove_min()['p'] for _ in range(3)] == [3, 2, 1]
+
+
+@given(xs=ints, arity=st.integers(min_value=2, max_value=5), reverse=st.booleans())
+def test__Heap_arity_repr(xs, arity, reverse):
+    heap = Heap(xs, reverse=reverse, arity=arity)
+    heap2 = eval(repr(heap))
+    assert heap2._items == heap._items
+    assert heap2.is_heap_satisfied()
+
+
+def test__Heap_arity_root():
+    heap = Heap([1, 2, 3], arity=4)
+    with pytest.raises(TypeError):
+        heap.root
+    with pytest.raises(ValueError):
+        Heap(arity=1)
+
+
+@given(xs=ints, ys=ints, reverse=st.booleans())
+def test__Heap_pushpop(xs, ys, reverse):
+    heap = Heap(xs, reverse=reverse)
+    values = list(xs)
+    for y in ys:
+        expected = sorted(values + [y], reverse=reverse)[0]
+        assert heap.pushpop(y) == expected
+        values.append(y)
+        values.remove(expected)
+        assert heap.is_heap_satisfied()
+    assert sorted(heap.to_list('inorder')) == sorted(values)
+
+
+@given(xs=ints, ys=ints)
+def test__Heap_replace(xs, ys):
+    heap = Heap(xs)
+    values = list(xs)
+    for y in ys:
+        if values:
+            expected = min(values)
+            values.remove(expected)
+            assert heap.replace(y) == expected
+        else:
+            assert heap.replace(y) is None
+        values.append(y)
+        assert heap.is_heap_satisfied()
+    assert sorted(heap.to_list('inorder')) == sorted(values)
+
+
+@given(ints)
+def test__Heap_dump_load(roundtrip, xs):
+    heap = Heap(xs)
+    loaded, _ = roundtrip(heap, Heap)
+    assert loaded.is_heap_satisfied()
+    assert loaded.to_list('levelorder') == heap.to_list('levelorder')
+
+
+@given(xs=ints, arity=st.integers(min_value=3, max_value=5))
+def test__Heap_arity_str_iter(xs, arity):
+    heap = Heap(xs, arity=arity)
+    assert str(heap) == str(heap._items)
+    assert sorted(heap) == sorted(xs)
+    assert list(heap) == heap._items
@@ -0,0 +1,113 @@
+from Trees.IndexedHeap import IndexedHeap
+
+import pytest
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+def _drain(heap):
+    result = []
+    while len(heap):
+        result.append(heap.remove_min())
+    return result
+
+
+@given(ints)
+def test__IndexedHeap_order(xs):
+    heap = IndexedHeap()
+    for i, x in enumerate(xs):
+        heap.insert(i, x)
+        assert heap.is_heap_satisfied()
+    expected = sorted(enumerate(xs), key=lambda p: (p[1], p[0]))
+    if xs:
+        assert heap.find_smallest() == expected[0]
+    assert _drain(heap) == expected
+    assert heap.remove_min() is None
+    assert heap.find_smallest() is None
+
+
+@given(ints)
+def test__IndexedHeap_bulk(xs):
+    heap = IndexedHeap(list(enumerate(xs)))
+    assert heap.is_heap_satisfied()
+    assert _drain(heap) == sorted(enumerate(xs), key=lambda p: (p[1], p[0]))
+
+
+@given(ints, st.lists(st.tuples(st.integers(min_value=0, max_value=50), st.integers())))
+def test__IndexedHeap_update(xs, changes):
+    heap = IndexedHeap({i: x for i, x in enumerate(xs)})
+    priorities = dict(enumerate(xs))
+    order = list(range(len(xs)))
+    for handle, priority in changes:
+        if handle not in priorities:
+            order.append(handle)
+        heap.update(handle, priority)
+        priorities[handle] = priority
+        assert heap.is_heap_satisfied()
+        assert heap[handle] == priority
+    expected = sorted(priorities.items(), key=lambda p: (p[1], order.index(p[0])))
+    assert _drain(heap) == expected
+
+
+@given(ints, st.lists(st.integers(min_value=0, max_value=50)))
+def test__IndexedHeap_remove(xs, handles):
+    heap = IndexedHeap(list(enumerate(xs)))
+    priorities = dict(enumerate(xs))
+    for handle in handles:
+        if handle in priorities:
+            assert handle in heap
+            assert heap.remove(handle) == priorities.pop(handle)
+        else:
+            assert handle not in heap
+            with pytest.raises(KeyError):
+                heap.remove(handle)
+        assert heap.is_heap_satisfied()
+    assert _drain(heap) == sorted(priorities.items(), key=lambda p: (p[1], p[0]))
+
+
+@given(ints)
+def test__IndexedHeap_decrease_increase_key(xs):
+    heap = IndexedHeap(list(enumerate(xs)))
+    for i, x in enumerate(xs):
+        if i % 2:
+            heap.decrease_key(i, x - 10)
+        else:
+            heap.increase_key(i, x + 10)
+        assert heap.is_heap_satisfied()
+    expected = [(i, x - 10 if i % 2 else x + 10) for i, x in enumerate(xs)]
+    assert _drain(heap) == sorted(expected, key=lambda p: (p[1], p[0]))
+
+
+def test__IndexedHeap_errors():
+    heap = IndexedHeap([('a', 5)])
+    with pytest.raises(ValueError):
+        heap.insert('a', 1)
+    with pytest.raises(ValueError):
+        heap.decrease_key('a', 6)
+    with pytest.raises(ValueError):
+        heap.increase_key('a', 4)
+    with pytest.raises(KeyError):
+        heap.decrease_key('b', 1)
+    with pytest.raises(KeyError):
+        heap['b']
+
+
+def test__IndexedHeap_dijkstra():
+    graph = {'a': {'b': 7, 'c': 9, 'f': 14}, 'b': {'c': 10, 'd': 15}, 'c': {'d': 11, 'f': 2},
+             'd': {'e': 6}, 'e': {}, 'f': {'e': 9}}
+    distances = {}
+    heap = IndexedHeap([('a', 0)])
+    while len(heap):
+        node, distance = heap.remove_min()
+        distances[node] = distance
+        for neighbor, weight in graph[node].items():
+            if neighbor in distances:
+                continue
+            if neighbor not in heap:
+                heap.insert(neighbor, distance + weight)
+            elif distance + weight < heap[neighbor]:
+                heap.decrease_key(neighbor, distance + weight)
+    assert distances == {'a': 0, 'b': 7, 'c': 9, 'd': 20, 'e': 20, 'f': 11}
@@ -0,0 +1,101 @@
+from Trees.BinaryTree import BinaryTree, Node
+from Trees.LeftistHeap import LeftistHeap
+
+import pytest
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+def test__LeftistHeap_super():
+    x = LeftistHeap()
+    assert isinstance(x, BinaryTree)
+
+
+def test__LeftistHeap_is_heap_satisfied1():
+    heap = LeftistHeap()
+    heap.root = Node(0)
+    heap.root.left = Node(2)
+    heap.root.left.left = Node(3)
+    heap.root.right = Node(1)
+    assert heap.is_heap_satisfied()
+
+
+def test__LeftistHeap_is_heap_satisfied2():
+    heap = LeftistHeap()
+    heap.root = Node(0)
+    heap.root.right = Node(1)
+    assert not heap.is_heap_satisfied()
+
+
+def test__LeftistHeap_is_heap_satisfied3():
+    heap = LeftistHeap()
+    heap.root = Node(1)
+    heap.root.left = Node(0)
+    assert not heap.is_heap_satisfied()
+
+
+@given(ints)
+def test__LeftistHeap_insert(xs):
+    heap = LeftistHeap()
+    for x in xs:
+        heap.insert(x)
+        assert heap.is_heap_satisfied()
+        assert heap.find_smallest() == min(heap.to_list('inorder'))
+    assert sorted(heap.to_list('inorder')) == sorted(xs)
+
+
+@given(ints)
+def test__LeftistHeap_insert_list(xs):
+    heap = LeftistHeap(xs)
+    assert heap.is_heap_satisfied()
+    assert sorted(heap.to_list('inorder')) == sorted(xs)
+
+
+@given(ints)
+def test__LeftistHeap_remove_min(xs):
+    heap = LeftistHeap(xs)
+    result = []
+    for _ in xs:
+        result.append(heap.remove_min())
+        assert heap.is_heap_satisfied()
+    assert result == sorted(xs)
+    assert heap.remove_min() is None
+
+
+@given(ints, ints)
+def test__LeftistHeap_meld(xs, ys):
+    heap = LeftistHeap(xs)
+    other = LeftistHeap(ys)
+    heap.meld(other)
+    assert heap.is_heap_satisfied()
+    assert other.root is None
+    assert [heap.remove_min() for _ in xs + ys] == sorted(xs + ys)
+
+
+def test__LeftistHeap_spine():
+    heap = LeftistHeap(range(1000))
+    for x in range(1000, 2000):
+        heap.insert(-x)
+    spine = 0
+    node = heap.root
+    while node is not None:
+        spine += 1
+        node = node.right
+    assert spine <= 11
+
+
+@given(ints)
+def test__LeftistHeap_repr(xs):
+    heap = LeftistHeap(xs)
+    assert sorted(eval(repr(heap)).to_list('inorder')) == sorted(xs)
+
+
+def test__LeftistHeap_meld_self():
+    heap = LeftistHeap([3, 1, 2])
+    with pytest.raises(ValueError):
+        heap.meld(heap)
+    assert heap.is_heap_satisfied()
+    assert [heap.remove_min() for _ in range(3)] == [1, 2, 3]
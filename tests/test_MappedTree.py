@@ -0,0 +1,50 @@
+from Trees.AVLTree import AVLTree
+from Trees.MappedTree import MappedTree
+
+import os
+import tempfile
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+def _mapped(tree):
+    fd, path = tempfile.mkstemp()
+    with os.fdopen(fd, 'wb') as fp:
+        tree.dump(fp)
+    return MappedTree(path), path
+
+
+@given(ints, st.integers(), st.integers())
+def test__MappedTree(xs, lo, hi):
+    avl = AVLTree(xs)
+    mapped, path = _mapped(avl)
+    try:
+        assert len(mapped) == len(avl)
+        assert list(mapped) == list(avl)
+        for y in xs + [lo, hi]:
+            assert (y in mapped) == (y in avl)
+            assert mapped.floor(y) == avl.floor(y)
+            assert mapped.ceiling(y) == avl.ceiling(y)
+            assert mapped.rank(y) == avl.rank(y)
+        for inclusive in [(True, True), (False, True), (True, False), (False, False)]:
+            assert list(mapped.irange(lo, hi, inclusive)) == list(avl.irange(lo, hi, inclusive))
+            assert list(mapped.irange(lo, hi, inclusive, reverse=True)) == list(avl.irange(lo, hi, inclusive, reverse=True))
+            assert mapped.count_range(lo, hi, inclusive) == avl.count_range(lo, hi, inclusive)
+        for k in range(len(avl)):
+            assert mapped.select(k) == avl.select(k)
+        assert mapped.find_smallest() == avl.find_smallest()
+        assert mapped.find_largest() == avl.find_largest()
+    finally:
+        mapped.close()
+        os.remove(path)
+
+
+def test__MappedTree_pickled():
+    mapped, path = _mapped(AVLTree(['b', 'a', 'c']))
+    with mapped:
+        assert list(mapped.irange('a', 'b')) == ['a', 'b']
+        assert 'c' in mapped
+    os.remove(path)
@@ -0,0 +1,98 @@
+from Trees.Merge import merge, external_sort
+
+import heapq
+import os
+import subprocess
+import sys
+import tempfile
+import pytest
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+@given(st.lists(ints))
+def test__merge(xss):
+    runs = [sorted(xs) for xs in xss]
+    assert list(merge(*runs)) == list(heapq.merge(*runs))
+
+
+@given(st.lists(ints))
+def test__merge_key_stable(xss):
+    runs = [sorted([(abs(x), i) for x in xs], key=lambda p: p[0]) for i, xs in enumerate(xss)]
+    merged = list(merge(*runs, key=lambda p: p[0]))
+    assert merged == sorted([p for run in runs for p in run], key=lambda p: p[0])
+
+
+def test__merge_lazy():
+    def forever(start):
+        x = start
+        while True:
+            yield x
+            x += 2
+    result = merge(forever(0), forever(1))
+    assert [next(result) for _ in range(10)] == list(range(10))
+
+
+@given(ints, st.integers(min_value=1, max_value=10))
+def test__external_sort(xs, run_size):
+    assert list(external_sort(iter(xs), run_size=run_size)) == sorted(xs)
+
+
+@given(ints, st.integers(min_value=1, max_value=10))
+def test__external_sort_key_stable(xs, run_size):
+    pairs = list(enumerate(xs))
+    result = list(external_sort(pairs, run_size=run_size, key=lambda p: p[1] % 3))
+    assert result == sorted(pairs, key=lambda p: p[1] % 3)
+
+
+def test__external_sort_cleans_up():
+    tmpdir = tempfile.mkdtemp()
+    xs = list(range(5000, 0, -1))
+    result = external_sort(xs, run_size=1000, tmpdir=tmpdir)
+    assert next(result) == 1
+    result.close()
+    assert os.listdir(tmpdir) == []
+    assert list(external_sort(xs, run_size=1000, tmpdir=tmpdir)) == sorted(xs)
+    assert os.listdir(tmpdir) == []
+    os.rmdir(tmpdir)
+
+
+def test__external_sort_many_runs():
+    '''
+    All runs share one file, so the number of runs is not limited by the number of open files.
+    The open file limit is lowered in a separate process so that it cannot affect the other tests.
+    '''
+    pytest.importorskip('resource')
+    script = '''
+import resource
+from Trees.Merge import external_sort
+soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+resource.setrlimit(resource.RLIMIT_NOFILE, (min(256, hard), hard))
+xs = list(range(3000, 0, -1))
+assert list(external_sort(xs, run_size=5)) == sorted(xs)
+'''
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', script], cwd=root,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert result.returncode == 0, result.stderr.decode()
+
+
+def test__external_sort_bad_run_size():
+    '''
+    A bad run_size is reported when external_sort is called, not when the result is first read.
+    '''
+    with pytest.raises(ValueError):
+        external_sort([3, 1, 2], run_size=0)
+
+
+def test__external_sort_single_run_in_memory():
+    '''
+    Exactly run_size values still fit in one run, so no file is created
+    (a tmpdir that does not exist would make creating one fail).
+    '''
+    xs = list(range(10, 0, -1))
+    missing = os.path.join(tempfile.gettempdir(), 'no-such-directory-for-external-sort')
+    assert list(external_sort(xs, run_size=10, tmpdir=missing)) == sorted(xs)
@@ -0,0 +1,130 @@
+from Trees.BinaryTree import BinaryTree
+from Trees.AVLTree import AVLTree
+from Trees.PersistentAVLTree import PersistentAVLTree
+from Trees.TreeMap import TreeMap
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+def _node_ids(tree):
+    return {id(node) for node in BinaryTree._preorder_nodes(tree.root)}
+
+
+def test__PersistentAVLTree_super():
+    x = PersistentAVLTree()
+    assert isinstance(x, AVLTree)
+
+
+@given(ints, ints)
+def test__PersistentAVLTree_insert(xs, ys):
+    tree = PersistentAVLTree(xs)
+    versions = [tree]
+    for y in ys:
+        versions.append(versions[-1].insert(y))
+    for i, version in enumerate(versions):
+        assert version.is_avl_satisfied()
+        assert list(version) == sorted(set(xs + ys[:i]))
+
+
+@given(ints, ints)
+def test__PersistentAVLTree_remove(xs, ys):
+    tree = PersistentAVLTree(xs)
+    versions = [tree]
+    for y in ys + xs:
+        versions.append(versions[-1].remove(y))
+    for i, version in enumerate(versions):
+        removed = set((ys + xs)[:i])
+        assert version.is_avl_satisfied()
+        assert list(version) == sorted(set(xs) - removed)
+
+
+def test__PersistentAVLTree_sharing():
+    tree = PersistentAVLTree(range(1000))
+    new = tree.insert(1000)
+    assert len(_node_ids(tree) - _node_ids(new)) <= 2 * tree.height()
+    new = tree.remove(500)
+    assert len(_node_ids(tree) - _node_ids(new)) <= 3 * tree.height()
+
+
+@given(ints, ints, st.integers(), st.integers())
+def test__PersistentAVLTree_bulk(xs, ys, lo, hi):
+    tree = PersistentAVLTree(xs)
+    assert list(tree.insert_list(ys)) == sorted(set(xs + ys))
+    assert list(tree.remove_list(ys)) == sorted(set(xs) - set(ys))
+    assert list(tree.remove_range(lo, hi)) == sorted(x for x in set(xs) if not lo <= x <= hi)
+    lt, ge = tree.split(lo)
+    assert list(lt) + list(ge) == list(tree)
+    joined = PersistentAVLTree.join(lt, ge)
+    assert joined.is_avl_satisfied()
+    assert list(joined) == list(lt) + list(ge) == sorted(set(xs))
+
+
+@given(ints, ints)
+def test__AVLTree_snapshot(xs, ys):
+    avl = AVLTree(xs)
+    snapshot = avl.snapshot()
+    for y in ys:
+        avl.insert(y)
+    for x in xs[::2]:
+        avl.remove(x)
+    assert list(snapshot) == sorted(set(xs))
+    assert list(avl) == sorted(set(xs + ys) - set(xs[::2]))
+    assert snapshot.is_avl_satisfied()
+    assert avl.is_avl_satisfied()
+    snapshot.remove_list(xs)
+    avl.insert_list(xs)
+    assert len(snapshot) == 0
+    assert list(avl) == sorted(set(xs + ys))
+    assert avl.is_avl_satisfied()
+
+
+@given(ints, st.integers(), st.integers())
+def test__AVLTree_snapshot_remove_range(xs, lo, hi):
+    avl = AVLTree(xs)
+    snapshot = avl.snapshot()
+    avl.remove_range(lo, hi)
+    lt, ge = snapshot.split(lo)
+    assert list(avl) == sorted(x for x in set(xs) if not lo <= x <= hi)
+    assert list(lt) + list(ge) == sorted(set(xs))
+    assert len(snapshot) == 0
+
+
+def test__AVLTree_snapshot_is_cheap():
+    avl = AVLTree(range(1000))
+    snapshot = avl.snapshot()
+    assert _node_ids(snapshot) == _node_ids(avl)
+    avl.insert(1000)
+    assert len(_node_ids(snapshot) - _node_ids(avl)) <= 2 * avl.height()
+
+
+def test__AVLTree_snapshot_copies_once():
+    '''
+    The copies made by one insert belong to the tree,
+    so the next insert down the same path modifies them in place and only allocates its new node.
+    '''
+    avl = AVLTree(range(1000))
+    snapshot = avl.snapshot()
+    for x in range(1000, 1010):
+        before = _node_ids(avl)
+        avl.insert(x)
+        if x > 1000:
+            assert len(_node_ids(avl) - before) == 1
+    assert list(snapshot) == list(range(1000))
+    assert list(avl) == list(range(1010))
+    assert avl.is_avl_satisfied()
+
+
+@given(st.lists(st.tuples(st.integers(), st.integers())), st.integers(), st.integers())
+def test__TreeMap_snapshot(xs, key, payload):
+    tm = TreeMap(xs)
+    snapshot = tm.snapshot()
+    tm[key] = payload
+    tm.setdefault(key + 1, payload)
+    assert list(snapshot.items()) == sorted(dict(xs).items())
+    d = dict(xs)
+    d[key] = payload
+    d.setdefault(key + 1, payload)
+    assert list(tm.items()) == sorted(d.items())
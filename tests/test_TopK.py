@@ -0,0 +1,77 @@
+from Trees.TopK import TopK, nsmallest, nlargest
+
+import heapq
+import pytest
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+ints = st.lists(st.integers())
+
+
+@given(ints, st.integers(min_value=0, max_value=20))
+def test__TopK_push(xs, k):
+    top = TopK(k)
+    for x in xs:
+        top.push(x)
+        assert len(top) <= k
+    assert top.result() == sorted(xs, reverse=True)[:k]
+
+
+@given(ints, st.integers(min_value=0, max_value=20))
+def test__TopK_extend(xs, k):
+    top = TopK(k, largest=False)
+    top.extend(xs[:len(xs) // 2])
+    top.extend(iter(xs[len(xs) // 2:]))
+    assert top.result() == sorted(xs)[:k]
+
+
+@given(ints, st.integers(min_value=1, max_value=20))
+def test__TopK_pushpop(xs, k):
+    top = TopK(k)
+    dropped = []
+    for x in xs:
+        out = top.pushpop(x)
+        if out is not None:
+            dropped.append(out)
+    assert sorted(dropped + top.result()) == sorted(xs)
+    assert all(d <= min(top.result()) for d in dropped)
+
+
+def test__TopK_replace():
+    top = TopK(2)
+    assert top.replace(5) is None
+    assert top.replace(7) is None
+    assert top.replace(1) == 5
+    assert top.result() == [7, 1]
+
+
+@given(ints, st.integers(min_value=0, max_value=20))
+def test__nsmallest_nlargest(xs, k):
+    assert nsmallest(k, xs) == heapq.nsmallest(k, xs)
+    assert nlargest(k, xs) == heapq.nlargest(k, xs)
+    assert [abs(x) for x in nsmallest(k, xs, key=abs)] == sorted(abs(x) for x in xs)[:k]
+    assert [abs(x) for x in nlargest(k, xs, key=abs)] == sorted((abs(x) for x in xs), reverse=True)[:k]
+
+
+def test__TopK_negative():
+    with pytest.raises(ValueError):
+        TopK(-1)
+
+
+def test__nlargest_ties():
+    xs = [10, 3, 17, 24, 31, 5, 12]
+    key = lambda x: x % 7
+    assert nlargest(3, xs, key=key) == heapq.nlargest(3, xs, key=key) == [5, 12, 10]
+    assert nsmallest(3, xs, key=key) == heapq.nsmallest(3, xs, key=key)
+
+
+@given(ints, st.integers(min_value=0, max_value=20))
+def test__nsmallest_nlargest_ties(xs, k):
+    key = lambda x: x % 3
+    assert nsmallest(k, xs, key=key) == heapq.nsmallest(k, xs, key=key) == sorted(xs, key=key)[:k]
+    assert nlargest(k, xs, key=key) == heapq.nlargest(k, xs, key=key) == sorted(xs, key=key, reverse=True)[:k]
+    top = TopK(k, key=key)
+    for x in xs:
+        top.push(x)
+    assert top.result() == heapq.nlargest(k, xs, key=key)
@@ -0,0 +1,105 @@
+from Trees.BinaryTree import BinaryTree
+from Trees.AVLTree import AVLTree
+from Trees.TreeMap import TreeMap
+
+import pytest
+from hypothesis import given
+import hypothesis.strategies as st
+
+pairs = st.lists(st.tuples(st.integers(), st.integers()))
+
+
+def test__TreeMap_super():
+    x = TreeMap()
+    assert isinstance(x, AVLTree)
+    assert isinstance(x, BinaryTree)
+
+
+@given(pairs)
+def test__TreeMap_setitem_getitem(xs):
+    d = dict(xs)
+    tm = TreeMap(xs)
+    assert tm.is_avl_satisfied()
+    assert len(tm) == len(d)
+    for k in d:
+        assert tm[k] == d[k]
+
+
+@given(pairs)
+def test__TreeMap_items(xs):
+    d = dict(xs)
+    tm = TreeMap(d)
+    assert list(tm.items()) == sorted(d.items())
+    assert list(tm.keys()) == sorted(d)
+    assert list(tm.values()) == [d[k] for k in sorted(d)]
+    assert list(tm) == sorted(d)
+
+
+@given(pairs, st.integers())
+def test__TreeMap_get(xs, y):
+    d = dict(xs)
+    tm = TreeMap(xs)
+    assert tm.get(y) == d.get(y)
+    assert tm.get(y, 'missing') == d.get(y, 'missing')
+
+
+@given(pairs, st.integers())
+def test__TreeMap_setdefault(xs, y):
+    d = dict(xs)
+    tm = TreeMap(xs)
+    assert tm.setdefault(y, 'new') == d.setdefault(y, 'new')
+    assert list(tm.items()) == sorted(d.items(), key=lambda kv: kv[0])
+    assert tm.is_avl_satisfied()
+
+
+@given(pairs, pairs)
+def test__TreeMap_delitem(xs, ys):
+    d = dict(xs)
+    tm = TreeMap(xs)
+    for k, _ in ys:
+        if k in d:
+            del d[k]
+            del tm[k]
+        else:
+            with pytest.raises(KeyError):
+                del tm[k]
+        assert tm.is_avl_satisfied()
+    assert list(tm.items()) == sorted(d.items())
+
+
+def test__TreeMap_getitem_missing():
+    tm = TreeMap([(1, 'a')])
+    with pytest.raises(KeyError):
+        tm[2]
+
+
+def test__TreeMap_overwrite():
+    tm = TreeMap([(1, 'a'), (2, 'b')])
+    tm[1] = 'c'
+    assert len(tm) == 2
+    assert tm[1] == 'c'
+
+
+def test__TreeMap_repr():
+    tm = TreeMap({2: 'b', 1: 'a'})
+    assert repr(tm) == "TreeMap([(1, 'a'), (2, 'b')])"
+    assert list(eval(repr(tm)).items()) == list(tm.items())
+
+
+@given(pairs, pairs)
+def test__TreeMap_union(xs, ys):
+    a = TreeMap(xs)
+    b = TreeMap(ys)
+    d = dict(xs)
+    d.update(dict(ys))
+    c = a | b
+    assert type(c) == TreeMap
+    assert c.is_avl_satisfied()
+    assert list(c.items()) == sorted(d.items())
+    assert list((a - b).items()) == sorted((k, v) for k, v in dict(xs).items() if k not in dict(ys))
+
+
+@given(st.lists(st.tuples(st.integers(), st.text())))
+def test__TreeMap_dump_load(roundtrip, xs):
+    tm, _ = roundtrip(TreeMap(xs), TreeMap)
+    assert list(tm.items()) == sorted(dict(xs).items())